@@ -1,5 +1,7 @@
 import sympy as sp
 
+import laurent
+
 
 def analyze_borromean_rings():
     """
@@ -62,16 +64,20 @@ def analyze_borromean_rings():
     # 7. 核心验证: 是否包含亚历山大多项式因子 (t1-1)(t2-1)(t3-1)
     print(f"\n[3] 因子分析 (寻找 Borromean 核心结构):")
 
-    # 预期核心
-    core_poly = (t1 - 1) * (t2 - 1) * (t3 - 1)
-
-    # 试除
-    ratio = sp.simplify(tau / core_poly)
+    # 预期核心: (t1-1)(t2-1)(t3-1)
+    # 精确试除: 沿每个变量做综合除法，得到每个 (ti-1) 的确切重数
+    # (Laurent 环中单项式是单位，所以分母是 t1 之类的情况自动包含在内)
+    images = [(1, 0, 0), (0, 1, 0), (0, 0, 1)]
+    tau_exact = laurent.sub(laurent.affine_evaluate(relator_str, images),
+                            laurent.affine_evaluate(rev_relator, images))
+    residual, multiplicities = laurent.strip_t_minus_1(tau_exact) if tau_exact else ({}, [0, 0, 0])
+    print("(t1-1), (t2-1), (t3-1) 重数:", multiplicities)
 
-    if ratio.is_polynomial(t1, t2, t3) or ratio.as_numer_denom()[1] == t1:
-        # 允许分母是 t1 (类似之前的 Whitehead link 结果)
+    if all(multiplicities):
         print(f">>> 成功捕获核心因子 (t1-1)(t2-1)(t3-1)！ <<<")
         print("剩余因子结构 (Residual):")
+        k1, k2, k3 = multiplicities
+        ratio = laurent.to_sympy(residual, (t1, t2, t3)) * (t1 - 1) ** (k1 - 1) * (t2 - 1) ** (k2 - 1) * (t3 - 1) ** (k3 - 1)
         print(sp.factor(ratio))
     else:
         print("未直接发现完整的三元因子，尝试部分因式分解...")
@@ -1,5 +1,7 @@
 import sympy as sp
 
+import laurent
+
 
 def analyze_link_torsion(link_name, relator_str):
     """
@@ -70,12 +72,18 @@ def analyze_link_torsion(link_name, relator_str):
     # 6. 验证是否包含 (t1-1) 或 (t2-1) 这种分圆因子
     # 对于 Whitehead Link, Delta(x,y) = (x-1)(y-1)
     print(f"\n[5] 结构特征检查:")
-    check_poly = (t1 - 1) * (t2 - 1)
-    if sp.simplify(tau / check_poly).is_polynomial(t1, t2):
+    # 用精确的 Laurent 多项式综合除法代替 sp.simplify(tau / check_poly)
+    images = [(1, 0), (0, 1)]
+    tau_exact = laurent.sub(laurent.affine_evaluate(relator_str, images),
+                            laurent.affine_evaluate(rev_relator, images))
+    if not tau_exact:
+        print("tau = 0")
+        return
+    residual, (k1, k2) = laurent.strip_t_minus_1(tau_exact)
+    print(f"(t1-1) 重数: {k1}, (t2-1) 重数: {k2}")
+    if k1 and k2:
         print(f"发现核心结构: (t1-1)(t2-1) 是 tau 的因子！")
-    else:
-        # 尝试其他可能的因子
-        pass
+        print("剩余因子:", sp.factor(laurent.to_sympy(residual, (t1, t2))))
 
 
 # --- 执行实验 ---
@@ -0,0 +1,96 @@
+"""
+Batched factorization of univariate Laurent polynomials.
+
+Factoring one Sage element at a time pays the Python-to-PARI overhead on
+every call, while the sweeps keep producing the same few polynomials.
+Here every polynomial is split as
+
+    f = sign * content * t^shift * primitive
+
+(primitive: min exponent 0, content 1, positive leading coefficient), the
+primitive parts are deduplicated by their coefficients, the unseen ones are
+factored in a single PARI call per chunk (PARI ships with SnapPy, so no
+Sage is needed), and the factors are scattered back to every input.
+Results are cached across calls.
+"""
+import ast
+import math
+
+from snappy import pari
+
+
+# one call factors a whole vector; each result as [coefficients, multiplicity] pairs
+_FACTOR_ALL = 'apply(f -> my(m = factor(f)); vector(#m~, i, [Vecrev(m[i, 1]), m[i, 2]]), %s)'
+
+
+def split(f):
+    """(sign, content, shift, primitive) of a nonzero univariate laurent.py dict."""
+    shift = min(e[0] for e in f)
+    content = math.gcd(*f.values())
+    sign = 1 if f[max(f)] > 0 else -1
+    primitive = {(e[0] - shift,): c // (sign * content) for e, c in f.items()}
+    return sign, content, shift, primitive
+
+
+def _key(primitive):
+    return tuple(sorted(primitive.items()))
+
+
+def _to_pari(primitive, var='x'):
+    return ' + '.join('(%d)*%s^%d' % (c, var, e[0]) for e, c in primitive.items())
+
+
+def factor_unique(primitives):
+    """Factor primitive polynomials in one PARI call: a list of [(factor, multiplicity)] per input."""
+    if not primitives:
+        return []
+    vector = '[' + ', '.join(map(_to_pari, primitives)) + ']'
+    result = ast.literal_eval(str(pari(_FACTOR_ALL % vector)))
+    return [[({(i,): c for i, c in enumerate(coeffs) if c}, k) for coeffs, k in factors]
+            for factors in result]
+
+
+class BatchFactorizer:
+    def __init__(self, chunk=1024, cache_size=1 << 16):
+        self.chunk = chunk
+        self.cache_size = cache_size
+        self.cache = {}
+        self.polynomials = 0
+        self.factored = 0
+
+    def factor_all(self, polys):
+        """
+        (sign, content, shift, factors) for every laurent.py dict in polys,
+        with f = sign * content * t^shift * prod(factor^k); (0, 0, 0, []) for 0.
+        """
+        splits = [split(f) if f else None for f in polys]
+        missing = {}
+        for s in splits:
+            if s is not None:
+                key = _key(s[3])
+                if key not in self.cache and key not in missing:
+                    missing[key] = s[3]
+        if len(self.cache) + len(missing) > self.cache_size:
+            self.cache.clear()
+        keys = list(missing)
+        for i in range(0, len(keys), self.chunk):
+            part = keys[i:i + self.chunk]
+            self.cache.update(zip(part, factor_unique([missing[k] for k in part])))
+        self.polynomials += len(polys)
+        self.factored += len(keys)
+        return [(s[0], s[1], s[2], self.cache[_key(s[3])]) if s is not None else (0, 0, 0, [])
+                for s in splits]
+
+
+def format_factors(sign, content, shift, factors, var='a'):
+    """Readable product, e.g. -2*a^-1*(a - 1)^2*(a^2 - 3*a + 1)."""
+    if sign == 0:
+        return '0'
+    parts = ['%s%d' % ('-' if sign < 0 else '', content)] if content != 1 or not factors else []
+    if sign < 0 and content == 1 and factors:
+        parts.append('-1')
+    if shift:
+        parts.append('%s^%d' % (var, shift))
+    for f, k in factors:
+        parts.append('(%s)' % pari(_to_pari(f, var)) + ('^%d' % k if k > 1 else ''))
+    return '*'.join(parts)
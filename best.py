@@ -0,0 +1,61 @@
+"""
+Bounded "best K" collector of relators per knot.
+
+Short relators are the cheap and readable ones, so long searches keep only
+the K shortest distinct relators (by reduced length, then by the degree span
+of their torsion tau = p - q) together with their evaluations, in a heap
+whose root is the worst kept entry.  Memory stays O(K) however long the
+search runs, and full factorization is left for the survivors.
+"""
+import heapq
+import itertools
+
+import laurent
+
+
+def span(f):
+    """Degree span of a univariate Laurent polynomial (0 for the zero polynomial)."""
+    if not f:
+        return 0
+    exps = [e[0] for e in f]
+    return max(exps) - min(exps)
+
+
+class BestRelators:
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+        self.words = set()
+        self.record = None
+        self.offered = 0
+        self._counter = itertools.count()
+
+    def offer(self, rel, p, q):
+        """
+        Consider a relator with its evaluations.  Returns True when it sets a
+        new record minimum (length, span) over everything offered so far.
+        """
+        self.offered += 1
+        if rel.word in self.words:
+            return False
+        key = (rel.length, span(laurent.sub(p, q)))
+        entry = (-key[0], -key[1], -next(self._counter), rel, p, q)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+            self.words.add(rel.word)
+        elif entry > self.heap[0]:
+            evicted = heapq.heapreplace(self.heap, entry)
+            self.words.discard(evicted[3].word)
+            self.words.add(rel.word)
+
+        if self.record is None or key < self.record:
+            self.record = key
+            return True
+        return False
+
+    def best(self):
+        """Kept (rel, p, q) triples, shortest first."""
+        return [(rel, p, q) for *_, rel, p, q in sorted(self.heap, reverse=True)]
+
+    def __len__(self):
+        return len(self.heap)
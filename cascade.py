@@ -0,0 +1,119 @@
+"""
+Staged test of "Delta divides p" that rejects with cheap invariants first.
+
+Most sampled relators fail the Alexander test, and the drivers find that
+out by factoring both polynomials.  If Delta divides p in Z[t, t^-1], then
+every ring map preserves it, so each of these is a necessary condition:
+
+    span       span(p) >= span(Delta)
+    t=1        Delta(1) divides p(1)
+    t=-1       Delta(-1) divides p(-1) (for a knot, +-det divides p(-1))
+    mod l      Delta divides p in F_l[t, t^-1], for a few small primes l
+
+Each costs a pass over p's coefficients, and the stages run cheapest
+first, so a failing relator is usually discarded before anything is
+divided over Z.  Only the survivors reach the exact test, and the
+rejections are counted per stage.
+"""
+from collections import Counter
+
+import laurent
+import prefactor
+from batch_factor import split
+from best import span
+
+
+def _values(f):
+    """(f(1), f(-1))."""
+    even = odd = 0
+    for e, c in f.items():
+        if e[0] % 2:
+            odd += c
+        else:
+            even += c
+    return even + odd, even - odd
+
+
+def _dense_mod(f, l):
+    """Coefficients mod l, low degree first, without the zero ends (a Laurent unit)."""
+    low = min(e[0] for e in f)
+    coeffs = [0] * (max(e[0] for e in f) - low + 1)
+    for e, c in f.items():
+        coeffs[e[0] - low] = c % l
+    while coeffs and not coeffs[-1]:
+        coeffs.pop()
+    start = 0
+    while start < len(coeffs) and not coeffs[start]:
+        start += 1
+    return coeffs[start:]
+
+
+def _divides_mod(d, coeffs, l):
+    """Whether monic d (dense, mod l) divides coeffs (dense, mod l)."""
+    r = list(coeffs)
+    n = len(d) - 1
+    for i in range(len(r) - 1, n - 1, -1):
+        c = r[i]
+        if c:
+            for j in range(n):
+                r[i - n + j] = (r[i - n + j] - c * d[j]) % l
+    return not any(r[:n])
+
+
+def radical(f):
+    """Product of the distinct irreducible factors of f (up to units), from prefactor.squarefree."""
+    _, _, _, primitive = split(f)
+    result = {(0,): 1}
+    for s, _ in prefactor.squarefree(primitive):
+        result = laurent.mul(result, s)
+    return result
+
+
+class Cascade:
+    def __init__(self, delta, primes=(2, 3, 5, 7, 11, 13)):
+        self.delta = delta
+        self.span = span(delta)
+        self.values = _values(delta)
+        self.modular = []
+        for l in primes:
+            d = _dense_mod(delta, l)
+            if d:
+                inverse = pow(d[-1], -1, l)
+                self.modular.append((l, [c * inverse % l for c in d]))
+        self.stages = ['zero', 'span', 't=1', 't=-1'] + ['mod %d' % l for l, _ in self.modular] + ['exact']
+        self.rejected = Counter()
+        self.tested = 0
+        self.passed = 0
+
+    def _reject(self, stage):
+        self.rejected[stage] += 1
+        return False
+
+    def screen(self, p):
+        """The cheap stages only: False if p is certainly not divisible by delta."""
+        self.tested += 1
+        if not p:
+            return self._reject('zero')
+        if span(p) < self.span:
+            return self._reject('span')
+        for stage, d, v in zip(('t=1', 't=-1'), self.values, _values(p)):
+            if (v if d == 0 else v % d):
+                return self._reject(stage)
+        for l, d in self.modular:
+            coeffs = _dense_mod(p, l)
+            if coeffs and not _divides_mod(d, coeffs, l):
+                return self._reject('mod %d' % l)
+        return True
+
+    def test(self, p):
+        """Whether delta divides p, exactly; the cheap stages run first."""
+        if not self.screen(p):
+            return False
+        if laurent.exact_divide(p, self.delta) is None:
+            return self._reject('exact')
+        self.passed += 1
+        return True
+
+    def report(self):
+        counts = ', '.join('%s %d' % (stage, self.rejected[stage]) for stage in self.stages)
+        return '%d tested, rejected by %s' % (self.tested, counts)
@@ -2,6 +2,10 @@ import snappy as sp
 
 from sage.all import *
 
+import knot_index
+import laurent
+from relator import Relator
+
 
 def check(depth, knot_name):
     R = PolynomialRing(QQ, 'a')
@@ -10,44 +14,32 @@ def check(depth, knot_name):
     M = sp.Manifold(knot_name)
     M.randomize()
     a = M.alexander_polynomial()
+    if index.entry(knot_name)['alexander'] is None:
+        index.record_alexander(knot_name, {(int(e),): int(c) for e, c in a.dict().items()})
 
     g = M.fundamental_group()
+    index.record_attempt(knot_name, g.num_generators() == 2)
     if not g.num_generators() == 2:
         # print('Knot:', knot_name)
         # print("Fundamental group:\n", g)
+        # sample again while the run's budget lasts, so the index sees every failure
+        if index.retry(knot_name):
+            check(depth + 1, knot_name)
         return
 
-    r = M.fundamental_group().relators()[0]
+    rel = Relator(g.relators()[0])
 
     if depth > 2048:
         # print('Knot:', knot_name)
         # print("Fundamental group:\n", g)
         return
 
-    cond_a = r.count('a') - r.count('A') == 0
-    cond_b = r.count('b') - r.count('B') == 0
+    cond_a = rel.exponent_sums[0] == 0
+    cond_b = rel.exponent_sums[1] == 0
 
-    p = 0
     if cond_a or cond_b:
-        for ch in reversed(r):
-            if cond_a:
-                if ch == 'a':
-                    p = p * t
-                if ch == 'A':
-                    p = p / t
-                if ch == 'b':
-                    p = p + 1
-                if ch == 'B':
-                    p = p - 1
-            if cond_b:
-                if ch == 'b':
-                    p = p * t
-                if ch == 'B':
-                    p = p / t
-                if ch == 'a':
-                    p = p + 1
-                if ch == 'A':
-                    p = p - 1
+        # the generator with zero exponent sum is multiplicative, the other additive
+        p = laurent.to_ring(rel.evaluate(), [t])
 
         result = False
         for factor, _ in list(p.factor()):
@@ -66,12 +58,11 @@ def check(depth, knot_name):
         check(depth + 1, knot_name)
 
 
-# All Rolfsen tables
-knots = []
-for i, j in zip(range(3, 12), [1, 1, 2, 3, 7, 21, 49, 165, 552, 2176]):
-    for k in range(1, j + 1):
-        knots.append('%d_%d' % (i, k))
+# All Rolfsen tables, minus knots that never gave 2 generators in earlier runs, cheapest first
+index = knot_index.KnotIndex()
+knots = index.knots(knot_index.rolfsen_knots(), order='cheapest')
 
 # Check all knots
 for k in knots:
     check(0, k)
+    index.save()
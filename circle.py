@@ -0,0 +1,228 @@
+"""
+Batched evaluation of Laurent polynomials on the unit circle.
+
+Factoring tells which cyclotomic and other factors a torsion has; for
+signature-like questions (where on |t| = 1 does tau or p vanish or change
+sign) values on the circle are enough, and they need no SymPy or Sage.
+At the M points t_k = exp(i theta_k), theta_k = 2 pi k / M,
+
+    f(t_k) = sum_j c_j exp(2 pi i j k / M) = M * ifft(c)[k],
+
+where c_j is folded modulo M (t_k^M = 1, so the folding is exact and
+negative exponents land where they belong).  A batch of n polynomials is
+one (n, M) array and one inverse FFT along the rows: O(n M log M).
+
+Zeros on the circle are found from the phase.  Crossing a simple zero at
+theta_0 flips the sign of f, so the phase jumps by about pi between the
+grid points on either side; roots at distance r from the circle only turn
+it by about 2 pi / (M r) per step.  zeros() reports every interval whose
+phase jump is within `angle` of pi, so the resolution is about the grid
+spacing 2 pi / M.
+
+A zero of even multiplicity does not flip the sign, so between grid points
+it is invisible to the phase.  scan() bounds |f| near such a zero, sends
+only the polynomials that could have one through a squarefree
+decomposition, where every zero is simple, refines each zero by bisection
+on the sign flip and reports it with its multiplicity.
+"""
+import numpy as np
+
+import laurent
+import prefactor
+
+
+def default_points(span):
+    """Power of two with at least 8 points per unit of degree span, and at least 256."""
+    return 1 << max(8, int(8 * (span + 1) - 1).bit_length())
+
+
+def to_dense(polys):
+    """
+    (coeffs, lows): an (n, L) integer array of coefficients, low degree first,
+    and the lowest exponent of every univariate laurent.py dict (0 for 0).
+    """
+    lows = np.array([min(e[0] for e in f) if f else 0 for f in polys], dtype=np.int64)
+    span = max((max(e[0] for e in f) - low for f, low in zip(polys, lows) if f), default=0)
+    coeffs = np.zeros((len(polys), span + 1), dtype=np.int64)
+    for row, (f, low) in enumerate(zip(polys, lows)):
+        for e, c in f.items():
+            coeffs[row, e[0] - low] = c
+    return coeffs, lows
+
+
+def evaluate(coeffs, lows=None, points=None):
+    """
+    (thetas, values): values[r, k] is the polynomial t^lows[r] * sum_j
+    coeffs[r, j] t^j at t = exp(i thetas[k]), for M = points angles.
+    """
+    coeffs = np.atleast_2d(coeffs)
+    n, length = coeffs.shape
+    if points is None:
+        points = default_points(length - 1)
+    if lows is None:
+        lows = np.zeros(n, dtype=np.int64)
+    # fold the coefficients modulo M, the lowest exponents included
+    folded = np.zeros((n, points), dtype=np.float64)
+    columns = (np.asarray(lows)[:, None] + np.arange(length)) % points
+    np.add.at(folded, (np.arange(n)[:, None], columns), coeffs)
+    thetas = 2 * np.pi * np.arange(points) / points
+    return thetas, np.fft.ifft(folded, axis=1) * points
+
+
+def evaluate_at(coeffs, lows, thetas):
+    """values[r, k] at arbitrary angles thetas[k], directly: for a few points off the grid."""
+    coeffs = np.atleast_2d(coeffs)
+    powers = np.exp(1j * np.outer(np.arange(coeffs.shape[1]), thetas))
+    return (coeffs @ powers) * np.exp(1j * np.outer(lows, thetas))
+
+
+def evaluate_polys(polys, points=None):
+    """evaluate() on a list of univariate laurent.py dicts."""
+    return evaluate(*to_dense(polys), points=points)
+
+
+def centered(values, thetas, centers):
+    """
+    values * t^-centers row by row; a polynomial symmetric about its center
+    (Delta, and tau for many relators) becomes real on the circle.
+    """
+    return values * np.exp(-1j * np.outer(centers, thetas))
+
+
+def centers(polys):
+    """(lowest + highest exponent) / 2 of every polynomial (0 for 0)."""
+    return np.array([(min(e[0] for e in f) + max(e[0] for e in f)) / 2 if f else 0 for f in polys])
+
+
+def _crossings(values, angle, tol):
+    """Grid indices (rows, k) of exact zeros, and of intervals [k, k+1] the phase crosses by ~pi."""
+    magnitude = np.abs(values)
+    scale = magnitude.max(axis=1, keepdims=True)
+    alive = scale[:, 0] > 0
+    exact = (magnitude <= tol * scale) & alive[:, None]
+
+    following = np.roll(values, -1, axis=1)
+    jump = np.abs(np.angle(following * np.conj(values)))
+    # intervals touching an exact zero are already counted by it
+    crossing = (jump >= np.pi - angle) & ~exact & ~np.roll(exact, -1, axis=1) & alive[:, None]
+    return np.nonzero(exact), np.nonzero(crossing), magnitude
+
+
+def zeros(values, thetas, angle=np.pi / 4, tol=1e-9):
+    """
+    (rows, zero_thetas): one entry per zero found on the circle, at the
+    grid angle where |f| vanishes (relative to the row's maximum) or
+    interpolated inside an interval where the phase jumps by pi +- angle.
+    Identically zero rows are skipped; see scan() for repeated zeros.
+    """
+    (rows_exact, k_exact), (rows_cross, k_cross), magnitude = _crossings(values, angle, tol)
+    step = thetas[1] - thetas[0] if len(thetas) > 1 else 2 * np.pi
+    a = magnitude[rows_cross, k_cross]
+    b = magnitude[rows_cross, (k_cross + 1) % values.shape[1]]
+    # linear interpolation of |f| ~ |theta - theta_0| across the interval
+    theta_cross = thetas[k_cross] + step * a / (a + b)
+
+    rows = np.concatenate([rows_exact, rows_cross])
+    found = np.concatenate([thetas[k_exact], theta_cross])
+    order = np.lexsort((found, rows))
+    return rows[order], found[order]
+
+
+def _bisect(coeffs, lows, left, right, iterations=48):
+    """Sign-flip angles of the simple zeros bracketed by [left, right], one polynomial per row."""
+    def value(theta):
+        powers = np.exp(1j * np.outer(theta, np.arange(coeffs.shape[1])))
+        return (coeffs * powers).sum(axis=1) * np.exp(1j * lows * theta)
+
+    reference = value(left)
+    for _ in range(iterations):
+        middle = (left + right) / 2
+        same = (value(middle) * np.conj(reference)).real > 0
+        left = np.where(same, middle, left)
+        right = np.where(same, right, middle)
+    return (left + right) / 2
+
+
+def _strip_plus_minus_1(f):
+    """(rest, a, b) with f = rest * (t - 1)^a * (t + 1)^b, by synthetic division."""
+    f, a = laurent.t_minus_1_multiplicity(f, 0)
+    flipped, b = laurent.t_minus_1_multiplicity({e: -c if e[0] % 2 else c for e, c in f.items()}, 0)
+    return {e: -c if e[0] % 2 else c for e, c in flipped.items()}, a, b
+
+
+def _simple_zeros(parts, points, angle, tol):
+    """(part_rows, zero_thetas) of the zeros on the circle of polynomials with simple zeros there."""
+    coeffs, lows = to_dense(parts)
+    thetas, values = evaluate(coeffs, lows, points)
+    (rows_exact, k_exact), (rows_cross, k_cross), _ = _crossings(values, angle, tol)
+    refined = _bisect(coeffs[rows_cross], lows[rows_cross],
+                      thetas[k_cross], thetas[k_cross] + 2 * np.pi / points)
+    rows = np.concatenate([rows_exact, rows_cross])
+    return rows, np.concatenate([thetas[k_exact], refined]) % (2 * np.pi), values, coeffs
+
+
+def scan(polys, points=None, angle=np.pi / 4, tol=1e-9):
+    """
+    (rows, zero_thetas, multiplicities) of the zeros on the circle of
+    univariate laurent.py dicts, repeated zeros included.
+
+    (t - 1) and (t + 1) are divided out exactly.  On the rest, a zero of
+    multiplicity >= 2 at theta_0 forces |f| <= h^2 / 8 * sum |c_j| (j - m)^2
+    (m the center) at the grid point nearest to it, h = 2 pi / M; rows that
+    never get that small only have simple zeros on the circle, found from
+    the sign flips and refined by bisection.  The few rows that do are
+    split into squarefree parts (prefactor.squarefree_all, in PARI) and
+    those are scanned instead, each zero counted with its part's multiplicity.
+    """
+    found = []   # (row, theta, multiplicity)
+    rests, owners = [], []
+    for row, f in enumerate(polys):
+        if not f or max(f)[0] == min(f)[0]:
+            continue
+        rest, a, b = _strip_plus_minus_1(f)
+        if a:
+            found.append((row, 0.0, a))
+        if b:
+            found.append((row, np.pi, b))
+        if max(rest)[0] > min(rest)[0]:
+            rests.append(rest)
+            owners.append(row)
+    if rests:
+        if points is None:
+            points = 2 * default_points(max(max(f)[0] - min(f)[0] for f in rests))
+        rows, zeros_, values, coeffs = _simple_zeros(rests, points, angle, tol)
+        j = np.arange(coeffs.shape[1])
+        weights = np.abs(coeffs)
+        center = (weights * j).sum(axis=1, keepdims=True) / weights.sum(axis=1, keepdims=True)
+        bound = (2 * np.pi / points) ** 2 / 8 * (weights * (j - center) ** 2).sum(axis=1)
+        repeated = np.abs(values).min(axis=1) <= bound
+
+        owners = np.array(owners)
+        keep = ~repeated[rows]
+        found.extend(zip(owners[rows[keep]].tolist(), zeros_[keep].tolist(), [1] * int(keep.sum())))
+
+        flagged = np.flatnonzero(repeated)
+        parts, part_owners, part_weights = [], [], []
+        for r, split_parts in zip(flagged, prefactor.squarefree_all([prefactor.split(rests[r])[3]
+                                                                       for r in flagged])):
+            for part, k in split_parts:
+                parts.append(part)
+                part_owners.append(owners[r])
+                part_weights.append(k)
+        if parts:
+            rows, zeros_, _, _ = _simple_zeros(parts, points, angle, tol)
+            found.extend(zip(np.array(part_owners)[rows].tolist(), zeros_.tolist(),
+                             np.array(part_weights)[rows].tolist()))
+
+    if not found:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, np.zeros(0), empty
+    rows, zeros_, multiplicities = (np.array(column) for column in zip(*found))
+    order = np.lexsort((zeros_, rows))
+    return rows[order].astype(np.int64), zeros_[order], multiplicities[order].astype(np.int64)
+
+
+def zero_counts(values, thetas, **kwargs):
+    """Number of zeros on the circle of every row."""
+    rows, _ = zeros(values, thetas, **kwargs)
+    return np.bincount(rows, minlength=values.shape[0])
@@ -0,0 +1,89 @@
+"""
+Evaluations of all n cyclic conjugates of a relator in one O(n) pass.
+
+Rotating the first letter x of a relator to the end changes p by O(1):
+
+    x multiplicative (step s):   p -> t^-s p
+    x additive (delta):          p -> p - delta + delta t^T
+
+where T is the total exponent of the multiplicative generator.  Writing
+p_i = t^-E_i D_i with E_i the walk before letter i, only D changes, by
+delta (t^(E_i + T) - t^E_i), so all n evaluations are produced by
+mutating one dict.  For numeric points the closed form
+
+    p_i(x) = x^-E_i (p_0(x) + (x^T - 1) S_i(x)),   S_i = sum_{k<i} delta_k x^E_k
+
+is evaluated for every rotation at once with a cumulative sum.
+"""
+import numpy as np
+
+from relator import as_relator
+
+
+def cyclic_evaluations(relator, multiplicative=None, reverse=False):
+    """
+    Yield (i, shift, D) for every rotation i of the relator, where the p of
+    rotation i (q with reverse=True) is t^shift * D.
+
+    D is a laurent.py dict updated in place between rotations, so the whole
+    pass costs O(n); copy it (laurent.shift(D, (shift,)) does) to keep it.
+    """
+    rel = as_relator(relator)
+    if reverse:
+        rel = rel.reversed()
+    m = rel.multiplicative if multiplicative is None else multiplicative
+    gens = np.abs(rel.codes).astype(np.int64)
+    signs = np.sign(rel.codes).astype(np.int64)
+    steps = np.where(gens == m + 1, signs, 0)
+    walk = np.cumsum(steps) - steps
+    total = int(steps.sum())
+
+    D = rel.evaluate(m)
+    for i in range(rel.length):
+        yield i, -int(walk[i]), D
+        if steps[i] == 0:
+            delta, e = int(signs[i]), int(walk[i])
+            for exp, c in (((e + total,), delta), ((e,), -delta)):
+                c += D.get(exp, 0)
+                if c:
+                    D[exp] = c
+                else:
+                    D.pop(exp, None)
+
+
+def cyclic_values(relator, points, multiplicative=None, reverse=False):
+    """
+    p (or q with reverse=True) of every rotation at the given complex points,
+    as an array of shape (n, len(points)); row i is the rotation starting at
+    letter i.
+    """
+    rel = as_relator(relator)
+    if reverse:
+        rel = rel.reversed()
+    m = rel.multiplicative if multiplicative is None else multiplicative
+    x = np.asarray(points, dtype=complex)
+    gens = np.abs(rel.codes).astype(np.int64)
+    signs = np.sign(rel.codes).astype(np.int64)
+    steps = np.where(gens == m + 1, signs, 0)
+    walk = np.cumsum(steps) - steps
+    total = int(steps.sum())
+
+    terms = np.where(steps[:, None] == 0, signs[:, None] * x[None, :] ** walk[:, None], 0)
+    inclusive = np.cumsum(terms, axis=0)
+    S = inclusive - terms
+    p0 = inclusive[-1]
+    return x[None, :] ** (-walk[:, None]) * (p0[None, :] + (x[None, :] ** total - 1) * S)
+
+
+def cyclic_torsions(relator, multiplicative=None):
+    """
+    tau = p - q of every rotation, as (shift_p, D_p, shift_q, D_q) copies.
+
+    Rotation i of the relator reversed is rotation (n - i) mod n of the
+    reversed relator, so the q pass is read with that offset.
+    """
+    rel = as_relator(relator)
+    p_pass = [(shift, dict(D)) for _, shift, D in cyclic_evaluations(rel, multiplicative)]
+    q_pass = [(shift, dict(D)) for _, shift, D in cyclic_evaluations(rel, multiplicative, reverse=True)]
+    n = rel.length
+    return [p_pass[i] + q_pass[(n - i) % n] for i in range(n)]
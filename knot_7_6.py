@@ -1,49 +1,28 @@
 import sys
-import snappy as sp
 
 from sage.all import *
 
+import fox
+import laurent
+from best import BestRelators
+from cascade import Cascade, radical
+from relator import Relator
+from sampler import Sampler
+
 
 sys.setrecursionlimit(8912)
 
 
-knot2checker = {}
+knot2alexander = {}
+knot2best = {}
+knot2cascade = {}
 knot2relators = {}
+knot2sampler = {}
 
 
-def claculate_polynomial_by_a(t, p, ch):
-    if ch == 'a':
-        p = p * t
-    if ch == 'A':
-        p = p / t
-    if ch == 'b':
-        p = p + 1
-    if ch == 'B':
-        p = p - 1
-    return p
-
-
-def claculate_polynomial_by_b(t, p, ch):
-    if ch == 'b':
-        p = p * t
-    if ch == 'B':
-        p = p / t
-    if ch == 'a':
-        p = p + 1
-    if ch == 'A':
-        p = p - 1
-
-    return p
-
-
-def calculate(knot_name, R, g, t, r, a_poly, chosen_function, mapping_description):
-    p_val, q_val = QQ(0), QQ(0)
-
-    for char_in_relator in reversed(r):
-        p_val = chosen_function(t, p_val, char_in_relator)
-
-    for char_in_relator in r:
-        q_val = chosen_function(t, q_val, char_in_relator)
+def calculate(knot_name, t, rel, p, q, a_poly, mapping_description):
+    p_val = laurent.to_ring(p, [t])
+    q_val = laurent.to_ring(q, [t])
 
     a_result = []
     for a_factor, a_order in list(a_poly.factor()):
@@ -58,8 +37,7 @@ def calculate(knot_name, R, g, t, r, a_poly, chosen_function, mapping_descriptio
     if result:
         print('--' * 80)
         print('Knot:', knot_name)
-        print("Fundamental group (generators: a,b):\n", g)  # g.generators() might be better
-        print("Relator used:", r)
+        print("Relator used:", rel, "(length %d)" % rel.length)
         print(f"Mapping chosen: {mapping_description}")
         print("Alexander polynomial (variable 'a'):", a_poly)
         print("Calculated p (nu(S_R)(0,a)):", p_val)
@@ -71,53 +49,65 @@ def calculate(knot_name, R, g, t, r, a_poly, chosen_function, mapping_descriptio
             print("Calculated factors: []")
 
 
-def check(depth, knot_name):
+def check(depth, knot_name, keep=16):
     if depth > 8192:
         return
 
+    if knot_name not in knot2best:
+        knot2best[knot_name] = BestRelators(keep)
     if knot_name not in knot2relators:
-        knot2relators[knot_name] = {}
-    if knot_name not in knot2checker:
-        knot2checker[knot_name] = {}
+        knot2relators[knot_name] = set()
+    if knot_name not in knot2sampler:
+        knot2sampler[knot_name] = Sampler(knot_name, record_path='relators_%s.jsonl' % knot_name)
+    best = knot2best[knot_name]
     relators = knot2relators[knot_name]
-    checker = knot2checker[knot_name]
-
-    R = PolynomialRing(QQ, 'a')
-    t = R.gen()
-
-    M = sp.Manifold(knot_name)
-    M.randomize()
-    a = M.alexander_polynomial()
 
-    g = M.fundamental_group()
-    if not g.num_generators() == 2:
+    # Repeated triangulations are skipped before the group is computed
+    sampler = knot2sampler[knot_name]
+    g = sampler.sample()
+    if g is None or not g.num_generators() == 2:
         return
 
-    r = M.fundamental_group().relators()[0]
-    if r in checker:
-        return
-    checker[r] = True
+    word = sampler.relator(g)
+    rel = Relator(word)
 
-    cond_a = r.count('a') - r.count('A') == 0
-    cond_b = r.count('b') - r.count('B') == 0
+    cond_a = rel.exponent_sums[0] == 0
+    cond_b = rel.exponent_sums[1] == 0
     if cond_b:
-        r = r.replace('a', 'c')
-        r = r.replace('A', 'C')
-        r = r.replace('b', 'a')
-        r = r.replace('B', 'A')
-        r = r.replace('c', 'b')
-        r = r.replace('C', 'B')
-    if cond_a or cond_b:
-        relators[r] = True
-        chosen_function = claculate_polynomial_by_a
-        mapping_description = "'a' as multiplicative, 'b' as additive"
-        calculate(knot_name, R, g, t, r, a, chosen_function, mapping_description)
-        print('--' * 80)
+        rel = rel.swapped()
+    # rel is freely and cyclically reduced, so repeats of one relator share its word
+    if (cond_a or cond_b) and rel.word not in relators:
+        relators.add(rel.word)
+        sampler.accept(word)
+        if knot_name not in knot2alexander:
+            delta = fox.knot_alexander(knot_name, rel, sampler.base)
+            knot2alexander[knot_name] = delta
+            # calculate() checks every irreducible factor of delta, so screen with its radical
+            knot2cascade[knot_name] = Cascade(radical(delta))
+        # Delta | p (cheap invariants first); only the shortest relators that pass are kept
+        p = rel.evaluate(0)
+        if knot2cascade[knot_name].test(p) and best.offer(rel, p, rel.evaluate(0, reverse=True)):
+            print('New shortest relator for %s: %s (length %d, torsion span %d)'
+                  % (knot_name, rel, rel.length, best.record[1]))
         print('relator index:', len(relators))
 
     check(depth + 1, knot_name)
 
 
-knot2relators['7_6'] = {}
+def report(knot_name):
+    """Factor and print only the relators the bounded heap kept."""
+    R = PolynomialRing(QQ, 'a')
+    t = R.gen()
+    a = laurent.to_ring(laurent.normalize(knot2alexander[knot_name]), [t])
+    mapping_description = "'a' as multiplicative, 'b' as additive"
+    for rel, p, q in knot2best[knot_name].best():
+        calculate(knot_name, t, rel, p, q, a, mapping_description)
+
+
+knot2sampler['7_6'] = Sampler('7_6', record_path='relators_7_6.jsonl')
+knot2relators['7_6'] = set()
 while len(knot2relators['7_6']) < 100:
     check(0, '7_6')
+report('7_6')
+print('Sampler:', knot2sampler['7_6'].report())
+print('Cascade:', knot2cascade['7_6'].report())
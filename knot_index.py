@@ -0,0 +1,123 @@
+"""
+Persistent index of the Rolfsen knots for the sweeps.
+
+Every driver rebuilt the knot list from the table sizes and sampled every
+knot again, including knots whose groups never gave a 2-generator
+presentation under our sampler.  The index keeps, per knot, the crossing
+number, the symmetrized Alexander polynomial and determinant, how many
+attempts were made, whether (and after how many attempts) a 2-generator
+presentation was found, and known tunnel numbers.  It is a JSON file that
+each run updates, so later sweeps can skip hopeless knots and start with
+the cheap ones.
+
+A driver retries a knot whose sample has no 2 generators until the knot
+has used ATTEMPTS_PER_RUN attempts in this run (retry()), so one run
+records a whole budget of failures and knots() can skip a knot after it.
+"""
+import json
+import os
+from collections import Counter
+
+import laurent
+import two_bridge
+
+
+# (crossing number, number of knots) of the Rolfsen table as used by the drivers
+TABLE = list(zip(range(3, 12), [1, 1, 2, 3, 7, 21, 49, 165, 552, 2176]))
+
+# Torus knots and 2-bridge knots have tunnel number 1
+TORUS_KNOTS = {'3_1', '5_1', '7_1', '8_19', '9_1', '10_124'}
+TUNNEL_NUMBER_ONE = TORUS_KNOTS | set(two_bridge.CONWAY)
+
+# samples per knot and run before a driver gives up on 2 generators
+ATTEMPTS_PER_RUN = 128
+
+
+def rolfsen_knots(max_crossings=11):
+    return ['%d_%d' % (i, k) for i, j in TABLE if i <= max_crossings for k in range(1, j + 1)]
+
+
+def crossing_number(knot_name):
+    return int(knot_name.split('_')[0])
+
+
+class KnotIndex:
+    def __init__(self, path='knot_index.json'):
+        self.path = path
+        self.entries = {}
+        self.run_attempts = Counter()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def entry(self, knot_name):
+        if knot_name not in self.entries:
+            self.entries[knot_name] = {
+                'crossings': crossing_number(knot_name),
+                'alexander': None,
+                'determinant': None,
+                'attempts': 0,
+                'two_generator': None,
+                'attempts_to_two_generator': None,
+                'tunnel_number': 1 if knot_name in TUNNEL_NUMBER_ONE else None,
+            }
+        return self.entries[knot_name]
+
+    def record_attempt(self, knot_name, two_generator):
+        """One sampled presentation; two_generator says whether it had 2 generators."""
+        e = self.entry(knot_name)
+        e['attempts'] += 1
+        self.run_attempts[knot_name] += 1
+        if two_generator:
+            if not e['two_generator']:
+                e['attempts_to_two_generator'] = e['attempts']
+            e['two_generator'] = True
+        elif e['two_generator'] is None:
+            e['two_generator'] = False
+
+    def retry(self, knot_name):
+        """Whether knot_name has attempts left in this run."""
+        return self.run_attempts[knot_name] < ATTEMPTS_PER_RUN
+
+    def record_alexander(self, knot_name, delta):
+        """Store a univariate laurent.py Alexander polynomial, symmetrized, and its determinant."""
+        delta = laurent.symmetrize(delta)
+        e = self.entry(knot_name)
+        e['alexander'] = [[k[0], c] for k, c in sorted(delta.items())]
+        e['determinant'] = abs(sum(-c if k[0] % 2 else c for k, c in delta.items()))
+
+    def set_tunnel_number(self, knot_name, tunnel_number):
+        self.entry(knot_name)['tunnel_number'] = tunnel_number
+
+    def knots(self, candidates, skip_after=ATTEMPTS_PER_RUN, order='table'):
+        """
+        The candidates worth sampling.  Knots that went skip_after attempts
+        (by default one run's worth) without a 2-generator presentation are
+        dropped unless their tunnel number is known to be 1.  order='cheapest' puts knots with a known
+        2-generator presentation first (fewest attempts needed first), then
+        unseen knots, then the rest; order='table' keeps the given order.
+        """
+        def hopeless(name):
+            e = self.entries.get(name)
+            return (skip_after is not None and e is not None and not e['two_generator']
+                    and e['tunnel_number'] != 1 and name not in TUNNEL_NUMBER_ONE
+                    and e['attempts'] >= skip_after)
+
+        def cost(name):
+            e = self.entries.get(name)
+            if e is None:
+                return (1, 0)
+            if e['two_generator']:
+                return (0, e['attempts_to_two_generator'])
+            return (2, e['attempts'])
+
+        result = [name for name in candidates if not hopeless(name)]
+        if order == 'cheapest':
+            result.sort(key=cost)
+        return result
+
+    def save(self):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
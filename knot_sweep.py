@@ -0,0 +1,109 @@
+"""
+Sharded, resumable sweep over SnapPy's knot tables.
+
+The Rolfsen drivers keep everything in one process and stop at 11
+crossings.  Here a table (by default the 59937 Hoste-Thistlethwaite knots)
+is cut into shards of consecutive indices.  Each shard is one pool task
+that samples a 2-generator, exponent-balanced relator per knot and streams
+one JSON line per knot to <output_dir>/shard_NNNNN.jsonl.tmp, renamed to
+.jsonl when the shard is complete.  Memory is bounded by one knot per
+worker, and a restarted sweep skips every shard whose .jsonl exists.
+"""
+import json
+import multiprocessing
+import os
+
+import fox
+import laurent
+import links
+import modular
+from relator import Relator
+from sampler import Sampler
+
+
+def shard_path(output_dir, shard):
+    return os.path.join(output_dir, 'shard_%05d.jsonl' % shard)
+
+
+def analyze_knot(knot_name, attempts=64, seed=0):
+    """
+    Torsion and Alexander-divisibility record of one knot.  Delta comes from
+    the Fox minors of the base manifold's own presentation, not from the
+    sampled relator: for a balanced 2-generator relator
+    fox.relator_alexander() is p itself, and Delta | p would always hold.
+    """
+    sampler = Sampler(knot_name, seed=seed)
+    base = sampler.base.fundamental_group()
+    delta = laurent.symmetrize(
+        fox.alexander_polynomial(base.relators(), base.num_generators(), det=modular.determinant))
+    result = {'knot': knot_name, 'alexander': links.dict_to_json(delta)}
+    for _ in range(attempts):
+        g = sampler.sample()
+        if g is None or g.num_generators() != 2:
+            continue
+        word = sampler.relator(g)
+        rel = Relator(word)
+        if rel.multiplicative is None:
+            continue
+        record = sampler.accept(word)
+        p, q = rel.evaluate(), rel.evaluate(reverse=True)
+        tau = laurent.sub(p, q)
+        result.update(record)
+        result['tau'] = links.dict_to_json(tau)
+        result['alexander_divides_p'] = bool(p) and laurent.exact_divide(p, delta) is not None
+        result['alexander_divides_tau'] = bool(tau) and laurent.exact_divide(tau, delta) is not None
+        if tau:
+            residual, multiplicities = laurent.strip_t_minus_1(tau)
+            result['t_minus_1_multiplicity'] = multiplicities[0]
+            result['residual'] = links.dict_to_json(residual)
+        break
+    else:
+        # no balanced 2-generator relator
+        result['relator'] = None
+    result['attempts'] = sampler.counters['attempts']
+    return result
+
+
+def run_shard(task):
+    """Pool worker: analyze indices [start, stop) of the table into the shard file."""
+    table_name, output_dir, shard, start, stop, attempts = task
+    table = links.open_table(table_name)
+    path = shard_path(output_dir, shard)
+    with open(path + '.tmp', 'w') as out:
+        for index in range(start, stop):
+            result = analyze_knot(table[index].name(), attempts, seed=index)
+            result['index'] = index
+            out.write(json.dumps(result) + '\n')
+    os.replace(path + '.tmp', path)
+    return shard, stop - start
+
+
+def sweep(output_dir, table_name='ht_knots', shard_size=512, processes=None, attempts=64,
+          start=0, stop=None):
+    """
+    Analyze the shards covering table entries [start, stop) in a process
+    pool, skipping shards already completed by an earlier run.  Shards are
+    always whole, so runs with different ranges share them.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    total = len(links.open_table(table_name))
+    stop = total if stop is None else min(stop, total)
+    tasks = (
+        (table_name, output_dir, shard, shard * shard_size, min(total, (shard + 1) * shard_size), attempts)
+        for shard in range(start // shard_size, (stop + shard_size - 1) // shard_size)
+        if not os.path.exists(shard_path(output_dir, shard))
+    )
+    done = 0
+    with multiprocessing.Pool(processes, maxtasksperchild=16) as pool:
+        for shard, count in pool.imap_unordered(run_shard, tasks):
+            done += count
+            print('shard %d done (%d knots this run)' % (shard, done), flush=True)
+
+
+def read_shards(output_dir):
+    """Yield the records of every completed shard, in shard order."""
+    for name in sorted(os.listdir(output_dir)):
+        if name.startswith('shard_') and name.endswith('.jsonl'):
+            with open(os.path.join(output_dir, name)) as f:
+                for line in f:
+                    yield json.loads(line)
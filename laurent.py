@@ -0,0 +1,285 @@
+"""
+Exact multivariate Laurent polynomials with integer coefficients.
+
+A polynomial is a plain dict mapping exponent tuples to non-zero ints, e.g.
+t1 - t1^-1 t2 is {(1, 0): 1, (-1, 1): -1}.  Everything here is exact integer
+arithmetic, so divisibility questions get a yes/no answer instead of whatever
+sp.simplify happens to return on a large rational expression.
+"""
+import math
+
+from relator import as_relator, collect
+
+
+def monomial(exps, coeff=1):
+    return {tuple(exps): coeff} if coeff else {}
+
+
+def one(nvars):
+    return {(0,) * nvars: 1}
+
+
+def add(f, g):
+    h = dict(f)
+    for e, c in g.items():
+        c = h.get(e, 0) + c
+        if c:
+            h[e] = c
+        else:
+            h.pop(e, None)
+    return h
+
+
+def neg(f):
+    return {e: -c for e, c in f.items()}
+
+
+def sub(f, g):
+    return add(f, neg(g))
+
+
+def scale(f, k):
+    return {e: c * k for e, c in f.items()} if k else {}
+
+
+def shift(f, exps):
+    """Multiply f by the monomial t^exps."""
+    return {tuple(a + b for a, b in zip(e, exps)): c for e, c in f.items()}
+
+
+def mul(f, g):
+    h = {}
+    for e1, c1 in f.items():
+        for e2, c2 in g.items():
+            e = tuple(a + b for a, b in zip(e1, e2))
+            h[e] = h.get(e, 0) + c1 * c2
+    return {e: c for e, c in h.items() if c}
+
+
+def min_exponents(f):
+    return tuple(min(e[i] for e in f) for i in range(len(next(iter(f)))))
+
+
+def max_exponents(f):
+    return tuple(max(e[i] for e in f) for i in range(len(next(iter(f)))))
+
+
+def divide_by_t_minus_1(f, i):
+    """
+    Synthetic division of f by (t_i - 1) along variable i.
+
+    Returns the quotient, or None if (t_i - 1) does not divide f.  Terms are
+    grouped by their exponents in the other variables; each group is a
+    univariate Laurent polynomial in t_i whose quotient coefficients are the
+    running sums of its coefficients from the top degree down.
+    """
+    groups = {}
+    for e, c in f.items():
+        rest = e[:i] + e[i + 1:]
+        groups.setdefault(rest, {})[e[i]] = c
+
+    q = {}
+    for rest, coeffs in groups.items():
+        hi, lo = max(coeffs), min(coeffs)
+        running = 0
+        for k in range(hi, lo, -1):
+            running += coeffs.get(k, 0)
+            if running:
+                q[rest[:i] + (k - 1,) + rest[i:]] = running
+        if running + coeffs[lo] != 0:
+            return None
+    return q
+
+
+def t_minus_1_multiplicity(f, i):
+    """Return (quotient, k) where k is the exact power of (t_i - 1) dividing f."""
+    if not f:
+        raise ValueError('the zero polynomial is divisible by every power of (t - 1)')
+    k = 0
+    while True:
+        q = divide_by_t_minus_1(f, i)
+        if q is None:
+            return f, k
+        f, k = q, k + 1
+
+
+def strip_t_minus_1(f):
+    """
+    Divide out every (t_i - 1) factor of f.
+
+    Returns (quotient, multiplicities) with f = quotient * prod (t_i - 1)^k_i
+    and quotient not divisible by any (t_i - 1).
+    """
+    multiplicities = []
+    for i in range(len(next(iter(f)))):
+        f, k = t_minus_1_multiplicity(f, i)
+        multiplicities.append(k)
+    return f, multiplicities
+
+
+def _lex_leading(f):
+    e = max(f)
+    return e, f[e]
+
+
+def exact_divide(f, g):
+    """
+    Exact quotient f / g in the Laurent ring, or None if g does not divide f.
+
+    Both are shifted to ordinary polynomials with no monomial content; for a
+    single divisor the lex division algorithm leaves a zero remainder exactly
+    when g divides f, and monomials are units so the shifts do not matter.
+    """
+    if not g:
+        raise ZeroDivisionError('division by the zero polynomial')
+    if not f:
+        return {}
+    f_low, g_low = min_exponents(f), min_exponents(g)
+    r = shift(f, tuple(-a for a in f_low))
+    d = shift(g, tuple(-a for a in g_low))
+    d_exp, d_coeff = _lex_leading(d)
+
+    q = {}
+    while r:
+        r_exp, r_coeff = _lex_leading(r)
+        e = tuple(a - b for a, b in zip(r_exp, d_exp))
+        if min(e) < 0 or r_coeff % d_coeff:
+            return None
+        term = {e: r_coeff // d_coeff}
+        q = add(q, term)
+        r = sub(r, mul(term, d))
+    return shift(q, tuple(a - b for a, b in zip(f_low, g_low)))
+
+
+def normalize(f):
+    """Shift f to an ordinary polynomial with no monomial factor and positive lex-leading coefficient."""
+    if not f:
+        return {}
+    f = shift(f, tuple(-a for a in min_exponents(f)))
+    return neg(f) if _lex_leading(f)[1] < 0 else f
+
+
+def symmetrize(f):
+    """
+    Univariate f shifted so its exponents are centred on 0 (an odd span puts
+    the extra half step on the positive side), signed so that f(1) > 0, or
+    with positive leading coefficient when f(1) = 0.  For an Alexander
+    polynomial this is the Conway normalization Delta(1/t) = Delta(t), Delta(1) = 1.
+    """
+    if not f:
+        return {}
+    low, high = min_exponents(f)[0], max_exponents(f)[0]
+    f = shift(f, (-((low + high) // 2),))
+    value = sum(f.values())
+    return neg(f) if value < 0 or (value == 0 and _lex_leading(f)[1] < 0) else f
+
+
+def _to_dense(f):
+    """Univariate f with min exponent 0 -> coefficient list, lowest degree first."""
+    coeffs = [0] * (max(e[0] for e in f) + 1)
+    for e, c in f.items():
+        coeffs[e[0]] = c
+    return coeffs
+
+
+def _from_dense(coeffs):
+    return {(k,): c for k, c in enumerate(coeffs) if c}
+
+
+def _content(coeffs):
+    g = 0
+    for c in coeffs:
+        g = math.gcd(g, c)
+    return g
+
+
+def _pseudo_remainder(a, b):
+    a = list(a)
+    while len(a) >= len(b) and any(a):
+        lead, k = a[-1], len(a) - len(b)
+        a = [c * b[-1] for c in a]
+        for i, c in enumerate(b):
+            a[i + k] -= lead * c
+        while a and a[-1] == 0:
+            a.pop()
+    return a
+
+
+def gcd(f, g):
+    """
+    Greatest common divisor of two univariate Laurent polynomials, up to units.
+
+    Primitive pseudo-remainder sequence over Z; the result is normalized.
+    """
+    if f and len(next(iter(f))) != 1 or g and len(next(iter(g))) != 1:
+        raise ValueError('gcd is only implemented for univariate Laurent polynomials')
+    if not f:
+        return normalize(g)
+    if not g:
+        return normalize(f)
+    a, b = _to_dense(normalize(f)), _to_dense(normalize(g))
+    content = math.gcd(_content(a), _content(b))
+    a = [c // _content(a) for c in a]
+    b = [c // _content(b) for c in b]
+    if len(a) < len(b):
+        a, b = b, a
+    while len(b) > 1:
+        r = _pseudo_remainder(a, b)
+        if not r:
+            break
+        a, b = b, [c // _content(r) for c in r]
+    if len(b) == 1:
+        return {(0,): content}
+    return normalize(scale(_from_dense(b), content))
+
+
+def affine_evaluate(relator, images):
+    """
+    Top-right entry of the product of affine matrices [[t^phi(x), 1], [0, 1]].
+
+    relator is a relator.Relator (or a word over a, b, c, ..., upper case =
+    inverse) and images[k] is the exponent tuple phi of the k-th generator.
+    Reading the word left to right, a letter x adds the current scale t^E and
+    multiplies the scale by t^phi(x); an inverse letter first divides the
+    scale and then subtracts it.  This is exactly the matrix product the
+    analyze_* scripts build with SymPy, without any rational-function
+    simplification.
+    """
+    _, exps, signs = as_relator(relator).fox_terms(images)
+    return collect(exps, signs)
+
+
+def to_ring(f, gens):
+    """Build f in any ring (Sage, SymPy) from its generators."""
+    result = 0 * gens[0]
+    for e, c in f.items():
+        term = c
+        for x, k in zip(gens, e):
+            term = term * x ** k
+        result = result + term
+    return result
+
+
+def to_sympy(f, gens):
+    import sympy as sp
+
+    return sp.Add(*[c * sp.Mul(*[x ** k for x, k in zip(gens, e)]) for e, c in f.items()])
+
+
+def from_sympy(expr, gens):
+    """Convert a SymPy Laurent polynomial with integer coefficients."""
+    import sympy as sp
+
+    num, den = sp.fraction(sp.together(sp.expand(expr)))
+    den_terms = sp.Poly(den, *gens).as_dict()
+    if len(den_terms) != 1:
+        raise ValueError('not a Laurent polynomial: %s' % expr)
+    (den_exp, den_coeff), = den_terms.items()
+    f = {}
+    for e, c in sp.Poly(num, *gens).as_dict().items():
+        c, rem = divmod(int(c), int(den_coeff))
+        if rem:
+            raise ValueError('non-integer coefficient in %s' % expr)
+        if c:
+            f[tuple(a - b for a, b in zip(e, den_exp))] = c
+    return f
@@ -0,0 +1,144 @@
+"""
+Link-table version of the analyze_link.py / analyze_borromean.py experiment.
+
+Every generator x of the link group is sent to the affine map
+[[t^phi(x), 1], [0, 1]], where phi is SnapPy's map to the free
+abelianization (the same basis its multivariable Alexander polynomial
+uses).  For each relator we compute p, q (reversed relator) and
+tau = p - q exactly with laurent.py, the multiplicity of every (ti - 1),
+and whether SnapPy's Alexander polynomial divides p and tau.
+"""
+import json
+import os
+import multiprocessing
+
+import snappy
+from snappy.snap.nsagetools import MapToFreeAbelianization, alexander_polynomial_group
+
+import laurent
+from relator import as_relator
+
+
+_tables = {}
+
+
+def open_table(table_name):
+    if table_name not in _tables:
+        if table_name == 'rolfsen':
+            _tables[table_name] = snappy.LinkExteriors
+        elif table_name == 'ht':
+            _tables[table_name] = snappy.HTLinkExteriors(knots_vs_links='links')
+        elif table_name == 'ht_knots':
+            _tables[table_name] = snappy.HTLinkExteriors(knots_vs_links='knots')
+        else:
+            raise ValueError('unknown link table: %s' % table_name)
+    return _tables[table_name]
+
+
+def poly_to_dict(poly, nvars):
+    """Sage (Laurent) polynomial -> laurent.py dict."""
+    if nvars == 1:
+        return {(int(e),): int(c) for e, c in poly.dict().items()}
+    return {tuple(int(a) for a in e): int(c) for e, c in poly.dict().items()}
+
+
+def dict_to_json(f):
+    return [[list(e), c] for e, c in sorted(f.items())]
+
+
+def dict_from_json(items):
+    return {tuple(e): c for e, c in items}
+
+
+def analyze_relator(relator, images, alexander):
+    relator = as_relator(relator)
+    p = laurent.affine_evaluate(relator, images)
+    q = laurent.affine_evaluate(relator.reversed(), images)
+    tau = laurent.sub(p, q)
+    result = {
+        'relator': relator.word,
+        'p': dict_to_json(p),
+        'tau': dict_to_json(tau),
+    }
+    if tau:
+        residual, multiplicities = laurent.strip_t_minus_1(tau)
+        result['t_minus_1_multiplicities'] = multiplicities
+        result['residual'] = dict_to_json(residual)
+    if alexander:
+        result['alexander_divides_p'] = bool(p) and laurent.exact_divide(p, alexander) is not None
+        result['alexander_divides_tau'] = bool(tau) and laurent.exact_divide(tau, alexander) is not None
+    return result
+
+
+def analyze_link(task):
+    """
+    Worker for one table entry.  task = (table_name, index, cached_alexander);
+    cached_alexander is None when the link has not been seen before, in which
+    case the Alexander polynomial is computed and returned for caching.
+    """
+    table_name, index, cached_alexander = task
+    M = open_table(table_name)[index]
+    if M.num_cusps() < 2:
+        return None
+
+    G = M.fundamental_group()
+    phi = MapToFreeAbelianization(G)
+    images = [tuple(int(a) for a in phi(x)) for x in G.generators()]
+    nvars = len(images[0])
+
+    if cached_alexander is None:
+        alexander = poly_to_dict(alexander_polynomial_group(G), nvars)
+    else:
+        alexander = dict_from_json(cached_alexander)
+
+    return {
+        'table': table_name,
+        'index': index,
+        'link': M.name(),
+        'num_cusps': M.num_cusps(),
+        'generators': G.num_generators(),
+        'images': [list(e) for e in images],
+        'alexander': dict_to_json(alexander),
+        'relators': [analyze_relator(r, images, alexander) for r in G.relators()],
+    }
+
+
+def load_cache(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_cache(cache, path):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp, path)
+
+
+def sweep(table_name, output_path, cache_path='alexander_cache.json', processes=None,
+          start=0, stop=None, chunksize=4, cache_every=256):
+    """
+    Analyze table entries [start, stop) in a process pool, streaming one JSON
+    line per link to output_path as results arrive.  Alexander polynomials are
+    cached per table entry in cache_path so reruns never recompute them.
+    """
+    table = open_table(table_name)
+    stop = len(table) if stop is None else min(stop, len(table))
+    cache = load_cache(cache_path)
+    key = table_name + ':%d'
+    tasks = ((table_name, i, cache.get(key % i)) for i in range(start, stop))
+
+    done = 0
+    with multiprocessing.Pool(processes, maxtasksperchild=1024) as pool, open(output_path, 'a') as out:
+        for result in pool.imap_unordered(analyze_link, tasks, chunksize):
+            done += 1
+            if result is None:
+                continue
+            cache[key % result['index']] = result['alexander']
+            out.write(json.dumps(result) + '\n')
+            out.flush()
+            if done % cache_every == 0:
+                save_cache(cache, cache_path)
+    save_cache(cache, cache_path)
@@ -0,0 +1,174 @@
+"""
+Modular determinants of univariate Laurent polynomial matrices.
+
+Symbolic Bareiss elimination (fox.determinant) is fine for small
+presentations but the polynomial entries grow with the matrix.  Here the
+determinant is instead computed by evaluation and interpolation:
+
+    1. every row is shifted by a unit t^-m to ordinary polynomials, which
+       gives an a-priori degree bound D (sum of row degrees) and a
+       coefficient bound B (product of row l1-norms);
+    2. for each word-size prime p the matrix is evaluated at t = 0..D and all
+       D + 1 determinants are taken at once by batched modular Gaussian
+       elimination in NumPy int64;
+    3. the values are interpolated to the coefficients mod p, and enough
+       primes are combined with the CRT to recover the integers in (-B, B].
+
+determinant() has the same signature as fox.determinant so it can be passed
+as fox.alexander_polynomial(..., det=modular.determinant).
+"""
+import math
+
+import numpy as np
+
+
+_PRIME_LIMIT = 1 << 31  # products of two residues stay below 2**62
+_primes = []
+
+
+def _is_prime(n):
+    if n < 2:
+        return False
+    for q in (2, 3, 5, 7):
+        if n % q == 0:
+            return n == q
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in (2, 7, 61):  # deterministic below 2**32
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def primes(count):
+    """The count largest primes below 2**31, computed once."""
+    n = _primes[-1] - 2 if _primes else _PRIME_LIMIT - 1
+    while len(_primes) < count:
+        if _is_prime(n):
+            _primes.append(n)
+        n -= 2
+    return _primes[:count]
+
+
+def _inverse(a, p):
+    """Elementwise a^(p-2) mod p for an int64 array a of non-zero residues."""
+    result = np.ones_like(a)
+    base = a % p
+    e = p - 2
+    while e:
+        if e & 1:
+            result = result * base % p
+        base = base * base % p
+        e >>= 1
+    return result
+
+
+def batched_determinant(a, p):
+    """
+    Determinants mod p of a stack of square matrices a[k] (int64, reduced mod
+    p), by Gaussian elimination vectorized over the stack.
+    """
+    a = a.copy()
+    batch, n, _ = a.shape
+    det = np.ones(batch, dtype=np.int64)
+    rows = np.arange(batch)
+    for k in range(n):
+        nonzero = a[:, k:, k] != 0
+        singular = ~nonzero.any(axis=1)
+        det[singular] = 0
+        pivot = nonzero.argmax(axis=1) + k
+
+        swap = pivot != k
+        if swap.any():
+            top = a[rows[swap], k].copy()
+            a[rows[swap], k] = a[rows[swap], pivot[swap]]
+            a[rows[swap], pivot[swap]] = top
+            det[swap] = (p - det[swap]) % p
+
+        lead = a[:, k, k]
+        lead = np.where(singular, 1, lead)
+        det = det * lead % p
+        if k + 1 < n:
+            factors = a[:, k + 1:, k] * _inverse(lead, p)[:, None] % p
+            a[:, k + 1:, k:] = (a[:, k + 1:, k:] - factors[:, :, None] * a[:, None, k, k:] % p) % p
+    return det
+
+
+def _interpolate(values, p):
+    """Coefficients mod p (lowest first) of the polynomial taking values[x] at x = 0..D."""
+    coeffs = values.copy()
+    size = len(coeffs)
+    # Newton divided differences; with nodes 0..D the denominators are constant per level
+    for j in range(1, size):
+        inv_j = pow(j, p - 2, p)
+        coeffs[j:] = (coeffs[j:] - coeffs[j - 1:-1]) % p * inv_j % p
+    # Newton form -> monomial basis
+    poly = np.zeros(size, dtype=np.int64)
+    poly[0] = coeffs[-1]
+    for k in range(size - 2, -1, -1):
+        shifted = np.zeros(size, dtype=np.int64)
+        shifted[1:] = poly[:-1]
+        poly = (shifted - k * poly % p + p) % p
+        poly[0] = (poly[0] + coeffs[k]) % p
+    return poly
+
+
+def _crt(residues, moduli):
+    """Garner CRT of coefficient vectors, returned in the symmetric range."""
+    result = [int(r) for r in residues[0]]
+    modulus = moduli[0]
+    for r, p in zip(residues[1:], moduli[1:]):
+        inv = pow(modulus % p, p - 2, p)
+        result = [x + modulus * ((int(y) - x) * inv % p) for x, y in zip(result, r)]
+        modulus *= p
+    half = modulus // 2
+    return [x - modulus if x > half else x for x in result]
+
+
+def determinant(matrix, rows, cols):
+    """Determinant of the square submatrix of a sparse univariate Fox matrix."""
+    n = len(rows)
+    if n == 0:
+        return {(0,): 1}
+
+    dense, total_shift, degree, bound = [], 0, 0, 1
+    for i in rows:
+        entries = [matrix.get((i, j), {}) for j in cols]
+        exps = [e[0] for f in entries for e in f]
+        if not exps:
+            return {}
+        low = min(exps)
+        total_shift += low
+        degree += max(exps) - low
+        bound *= sum(abs(c) for f in entries for c in f.values())
+        dense.append([{e[0] - low: c for e, c in f.items()} for f in entries])
+
+    size = degree + 1
+    num_primes = 1
+    while math.prod(primes(num_primes)) <= 2 * bound:
+        num_primes += 1
+
+    points = np.arange(size, dtype=np.int64)
+    residues = []
+    for p in primes(num_primes):
+        values = np.zeros((size, n, n), dtype=np.int64)
+        for r, row in enumerate(dense):
+            for c, f in enumerate(row):
+                if not f:
+                    continue
+                v = np.zeros(size, dtype=np.int64)
+                for k in range(max(f), -1, -1):
+                    v = (v * points + f.get(k, 0) % p) % p
+                values[:, r, c] = v
+        residues.append(_interpolate(batched_determinant(values, p), p))
+
+    coeffs = _crt(residues, primes(num_primes))
+    return {(k + total_shift,): c for k, c in enumerate(coeffs) if c}
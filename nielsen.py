@@ -0,0 +1,99 @@
+"""
+Breadth-first exploration of one-relator presentations <a, b | r>.
+
+For any automorphism phi of the free group F(a, b), <a, b | phi(r)> presents
+the same group, so new relators can be produced directly from a known one
+instead of re-triangulating with M.randomize().  The moves are the Nielsen
+automorphisms a -> ab, a -> ba, b -> ba, b -> ab, the inversions a -> A,
+b -> B and the swap a <-> b, applied with str.translate; every result is
+freely and cyclically reduced and deduplicated by a canonical form (the
+least rotation of the word or of its inverse, so conjugates and inverses
+count once), and words longer than the length cap are not expanded.
+"""
+from collections import deque
+
+import numpy as np
+
+from relator import Relator, reduce_word
+
+
+MOVES = {
+    'a->ab': str.maketrans({'a': 'ab', 'A': 'BA'}),
+    'a->ba': str.maketrans({'a': 'ba', 'A': 'AB'}),
+    'b->ba': str.maketrans({'b': 'ba', 'B': 'AB'}),
+    'b->ab': str.maketrans({'b': 'ab', 'B': 'BA'}),
+    'a->A': str.maketrans('aA', 'Aa'),
+    'b->B': str.maketrans('bB', 'Bb'),
+    'a<->b': str.maketrans('abAB', 'baBA'),
+}
+
+
+def balance(codes):
+    """
+    Substitute B a for b in an int8 code array.  When a and b are both
+    meridians (2-bridge and Wirtinger presentations) neither has exponent
+    sum 0; afterwards the new b abelianizes to 1 and a is balanced.
+    """
+    pairs = np.zeros((len(codes), 2), dtype=np.int8)
+    pairs[:, 0] = codes
+    pairs[codes == 2] = (-2, 1)
+    pairs[codes == -2] = (-1, 2)
+    codes = pairs.ravel()
+    return codes[codes != 0]
+
+
+def _inverse(word):
+    return word[::-1].swapcase()
+
+
+def _least_rotation(word):
+    """Booth's algorithm: the lexicographically least rotation in O(n)."""
+    doubled = word + word
+    failure = [-1] * len(doubled)
+    k = 0
+    for j in range(1, len(doubled)):
+        ch = doubled[j]
+        i = failure[j - k - 1]
+        while i != -1 and ch != doubled[k + i + 1]:
+            if ch < doubled[k + i + 1]:
+                k = j - i - 1
+            i = failure[i]
+        if ch != doubled[k + i + 1]:
+            if ch < doubled[k]:
+                k = j
+            failure[j - k] = -1
+        else:
+            failure[j - k] = i + 1
+    return doubled[k:k + len(word)]
+
+
+def canonical(word):
+    """Least rotation of the cyclically reduced word or of its inverse."""
+    return min(_least_rotation(word), _least_rotation(_inverse(word)))
+
+
+def explore(relator, max_length, limit=None, moves=MOVES):
+    """
+    Yield distinct Relators reachable from relator by the moves, breadth
+    first, starting with relator itself (reduced).  Words longer than
+    max_length are dropped; limit caps the number yielded.
+    """
+    start = reduce_word(str(relator))
+    seen = {canonical(start)}
+    queue = deque([start])
+    count = 0
+    while queue:
+        word = queue.popleft()
+        yield Relator(word)
+        count += 1
+        if limit is not None and count >= limit:
+            return
+        for table in moves.values():
+            new = reduce_word(word.translate(table))
+            if not new or len(new) > max_length:
+                continue
+            key = canonical(new)
+            if key in seen:
+                continue
+            seen.add(key)
+            queue.append(new)
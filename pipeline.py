@@ -0,0 +1,187 @@
+"""
+Producer-consumer pipeline: SnapPy sampling, evaluation, factoring.
+
+The drivers alternate between SnapPy (randomize, fundamental_group) and
+Sage (factor, printing) in one thread, so each half waits for the other.
+Here the three stages run in their own worker processes joined by bounded
+queues:
+
+    tasks -> samplers -> relators -> evaluators -> evaluated -> factorizers -> results
+
+Each stage has its own pool size, and a full queue blocks the stage
+feeding it, so a slow factorizer throttles sampling instead of letting
+relators pile up in memory.  Factorizers drain whatever is queued into
+one batch_factor call, after prefactor has peeled off the cyclotomic and
+repeated factors.  A stage is shut down with one None per worker
+once the stage before it has finished.
+
+A task, relator or batch that raises does not take its worker down: it
+becomes an error record {'knot', 'stage', 'error'} on the results queue,
+and the worker moves on.  When an evaluator finishes it reports the
+per-stage counts of each knot's Cascade as a record {'knot', 'stage',
+'cascade'}.  Factorizers send their None from a finally block, and run()
+watches the factorizer exit codes, so a worker killed outright raises
+RuntimeError instead of hanging the caller.
+"""
+import multiprocessing
+import queue
+import threading
+import traceback
+
+import cascade
+import fox
+import laurent
+import prefactor
+from batch_factor import BatchFactorizer
+from relator import Relator
+from sampler import Sampler
+
+
+def _error(results, knot_name, stage):
+    results.put({'knot': knot_name, 'stage': stage, 'error': traceback.format_exc()})
+
+
+def _sample(tasks, relators, results, worker):
+    # tasks: (knot_name, wanted, attempts, seed)
+    for knot_name, wanted, attempts, seed in iter(tasks.get, None):
+        try:
+            sampler = Sampler(knot_name, seed=seed, worker=worker)
+            seen = set()
+            for _ in range(attempts):
+                g = sampler.sample()
+                if g is None or g.num_generators() != 2:
+                    continue
+                word = sampler.relator(g)
+                rel = Relator(word)
+                if rel.multiplicative is None or rel.word in seen:
+                    continue
+                seen.add(rel.word)
+                record = sampler.accept(word)
+                relators.put((knot_name, rel.word, record))
+                if len(seen) >= wanted:
+                    break
+        except Exception:
+            _error(results, knot_name, 'sample')
+
+
+def _evaluate(relators, evaluated, results):
+    screens = {}
+    for knot_name, word, record in iter(relators.get, None):
+        try:
+            evaluated.put(_evaluate_one(screens, knot_name, word, record))
+        except Exception:
+            _error(results, knot_name, 'evaluate')
+    # rejection counts of every knot's Alexander screen, once its relators are through
+    for knot_name, screen in screens.items():
+        results.put({'knot': knot_name, 'stage': 'evaluate', 'cascade': screen.report()})
+
+
+def _evaluate_one(screens, knot_name, word, record):
+    rel = Relator(word)
+    delta = fox.relator_alexander(rel)
+    if knot_name not in screens:
+        screens[knot_name] = cascade.Cascade(delta)
+    p, q = rel.evaluate(), rel.evaluate(reverse=True)
+    return {
+        'knot': knot_name,
+        'record': record,
+        'relator': word,
+        'alexander': delta,
+        'p': p,
+        'q': q,
+        'tau': laurent.sub(p, q),
+        'alexander_divides_p': screens[knot_name].test(p),
+    }
+
+
+def _factor(evaluated, results, batch_size=256):
+    try:
+        factorizer = BatchFactorizer()
+        done = False
+        while not done:
+            # whatever is already queued goes into the same PARI call
+            batch = [evaluated.get()]
+            while len(batch) < batch_size:
+                try:
+                    batch.append(evaluated.get_nowait())
+                except queue.Empty:
+                    break
+            stops = batch.count(None)
+            if stops:
+                done = True
+                batch = [r for r in batch if r is not None]
+                for _ in range(stops - 1):
+                    evaluated.put(None)   # another factorizer's
+            try:
+                factors, structures = prefactor.factor_all([r['tau'] for r in batch], factorizer)
+            except Exception:
+                for result in batch:
+                    _error(results, result['knot'], 'factor')
+                continue
+            for result, f, structure in zip(batch, factors, structures):
+                result['tau_factors'] = f
+                result['tau_structure'] = structure
+                results.put(result)
+    finally:
+        results.put(None)
+
+
+def _stage(target, args, count):
+    workers = [multiprocessing.Process(target=target, args=args(i), daemon=True) for i in range(count)]
+    for w in workers:
+        w.start()
+    return workers
+
+
+def _shutdown(workers, next_workers, next_queue):
+    """Wait for one stage, then send the next stage one None per worker."""
+    for w in workers:
+        w.join()
+    for _ in next_workers:
+        next_queue.put(None)
+
+
+def run(tasks, samplers=4, evaluators=1, factorizers=2, queue_size=256):
+    """
+    Run the pipeline over tasks (knot_name, wanted, attempts, seed) and
+    yield evaluated results as dicts, with 'tau_factors' = (sign, content,
+    shift, factors) from batch_factor and 'tau_structure' from
+    prefactor.decompose (None for tau = 0), as the factorizers finish them,
+    plus the error and Cascade report records described above.
+    """
+    task_queue = multiprocessing.Queue()
+    relators = multiprocessing.Queue(queue_size)
+    evaluated = multiprocessing.Queue(queue_size)
+    results = multiprocessing.Queue()
+
+    sample_workers = _stage(_sample, lambda i: (task_queue, relators, results, i), samplers)
+    evaluate_workers = _stage(_evaluate, lambda i: (relators, evaluated, results), evaluators)
+    factor_workers = _stage(_factor, lambda i: (evaluated, results), factorizers)
+
+    def feed():
+        for task in tasks:
+            task_queue.put(task)
+        for _ in sample_workers:
+            task_queue.put(None)
+        _shutdown(sample_workers, evaluate_workers, relators)
+        _shutdown(evaluate_workers, factor_workers, evaluated)
+
+    threading.Thread(target=feed, daemon=True).start()
+    finished = 0
+    while finished < factorizers:
+        try:
+            result = results.get(timeout=1)
+        except queue.Empty:
+            # a factorizer killed outright never sends its None
+            if all(w.exitcode is not None for w in factor_workers):
+                break
+            continue
+        if result is None:
+            finished += 1
+        else:
+            yield result
+    for w in factor_workers:
+        w.join()
+    crashed = [w.exitcode for w in sample_workers + evaluate_workers + factor_workers if w.exitcode]
+    if crashed:
+        raise RuntimeError('pipeline workers exited with codes %s' % crashed)
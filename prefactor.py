@@ -0,0 +1,225 @@
+"""
+Cheap structure of a torsion polynomial before full factorization.
+
+Torsions such as p - q or p - q_C often carry large cyclotomic factors and
+repeated factors (the (t^K - 1) structure analyze_torsion.py looks for),
+and these dominate the cost of a full factorization.  decompose() peels
+them off with exact integer arithmetic only:
+
+    f = sign * content * t^shift * prod Phi_n^k * prod residual_i^i
+
+the sign, content and monomial unit first, then the squarefree
+decomposition (Musser's repeated gcds, in PARI for a whole batch), then
+the cyclotomic factors of each squarefree part.  A binomial c (t^K - 1)
+is read off from its exponent gcd K as the Phi_d with d | K; otherwise
+each part is evaluated at every root of unity zeta_n with phi(n) <= degree
+in one NumPy pass, and Phi_n is divided out exactly (in PARI, again for
+the whole batch) wherever the value vanishes.  Only the residuals go to batch_factor.
+"""
+import ast
+import math
+
+import numpy as np
+from snappy import pari
+
+import laurent
+from batch_factor import _to_pari, split
+
+
+def derivative(f):
+    return {(e[0] - 1,): e[0] * c for e, c in f.items() if e[0]}
+
+
+def squarefree(f):
+    """Musser's algorithm: [(s_i, i)] with primitive f = prod s_i^i, s_i squarefree and coprime."""
+    parts = []
+    g = laurent.gcd(f, derivative(f))
+    w = laurent.exact_divide(f, g)
+    i = 1
+    while max(e[0] for e in w) > 0:
+        y = laurent.gcd(w, g)
+        s = laurent.exact_divide(w, y)
+        if max(e[0] for e in s) > 0:
+            parts.append((laurent.normalize(s), i))
+        g = laurent.exact_divide(g, y)
+        w, i = y, i + 1
+    return parts
+
+
+# Musser's loop in PARI for a vector of polynomials: [coefficients, i] per squarefree part
+_SQUAREFREE_ALL = (
+    "apply(f -> my(g = gcd(f, f'), w = f / g, r = List(), i = 1, y, s);"
+    " while(poldegree(w) > 0, y = gcd(w, g); s = w / y;"
+    " if(poldegree(s) > 0, s = s / content(s); listput(r, [Vecrev(s * sign(pollead(s))), i]));"
+    " g = g / y; w = y; i++); Vec(r), %s)")
+
+
+def squarefree_all(primitives, chunk=256):
+    """squarefree() of many primitive polynomials, a chunk per PARI call."""
+    result = []
+    for i in range(0, len(primitives), chunk):
+        vector = '[' + ', '.join(map(_to_pari, primitives[i:i + chunk])) + ']'
+        for parts in ast.literal_eval(str(pari(_SQUAREFREE_ALL % vector))):
+            result.append([({(j,): c for j, c in enumerate(coeffs) if c}, k) for coeffs, k in parts])
+    return result
+
+
+_cyclotomic = {}
+
+
+def cyclotomic(n):
+    """Phi_n as a laurent.py dict: (t^n - 1) divided by Phi_d for the proper divisors d of n."""
+    if n not in _cyclotomic:
+        f = {(n,): 1, (0,): -1}
+        for d in range(1, n):
+            if n % d == 0:
+                f = laurent.exact_divide(f, cyclotomic(d))
+        _cyclotomic[n] = f
+    return _cyclotomic[n]
+
+
+def totients(limit):
+    phi = np.arange(limit + 1)
+    for p in range(2, limit + 1):
+        if phi[p] == p:
+            phi[p::p] -= phi[p::p] // p
+    return phi
+
+
+_totients = np.zeros(0, dtype=np.int64)
+
+
+def _candidates(degree):
+    global _totients
+    # phi(n) >= sqrt(n / 2), so every Phi_n of degree <= degree has n <= 2 degree^2
+    limit = 2 * degree * degree
+    if len(_totients) <= limit:
+        _totients = totients(max(limit, 2 * len(_totients)))
+    phi = _totients[:limit + 1]
+    return np.flatnonzero((phi <= degree) & (np.arange(limit + 1) >= 1))
+
+
+def _roots_of_unity(f, tolerance=1e-6):
+    """The n whose zeta_n is (numerically) a root of f: every n with Phi_n | f, maybe a few more."""
+    exps = [e[0] for e in f]
+    degree = max(exps)
+    if degree == 0:
+        return []
+    if len(f) == 2 and min(exps) == 0 and f[(0,)] == -f[(degree,)]:
+        # c (t^K - 1): exactly the Phi_d with d | K
+        return [d for d in range(1, degree + 1) if degree % d == 0]
+    ns = _candidates(degree)
+    coeffs = np.array(laurent._to_dense(f), dtype=np.float64)
+    zeta = np.exp(2j * np.pi / ns)
+    values = np.polynomial.polynomial.polyval(zeta, coeffs)
+    scale = np.abs(coeffs).sum()
+    return ns[np.abs(values) < tolerance * scale].tolist()
+
+
+# exact division by the candidate Phi_n: [found n, coefficients of the rest] per polynomial
+_DIVIDE_CYCLOTOMIC = (
+    "apply(v -> my(s = v[1], found = List(), c);"
+    " for(j = 1, #v[2], c = polcyclo(v[2][j]); if(s %% c == 0, s = s / c; listput(found, v[2][j])));"
+    " [Vec(found), Vecrev(s)], %s)")
+
+
+def cyclotomic_factors_all(polys, tolerance=1e-6, chunk=256):
+    """
+    ([n, ...], residual) for each squarefree polynomial: the Phi_n dividing
+    it and the polynomial divided by them.  Candidates come from one NumPy
+    pass over the roots of unity, the exact divisions from one PARI call
+    per chunk.
+    """
+    result = []
+    for i in range(0, len(polys), chunk):
+        items = ['[%s, %s]' % (_to_pari(f), _roots_of_unity(f, tolerance)) for f in polys[i:i + chunk]]
+        for found, coeffs in ast.literal_eval(str(pari(_DIVIDE_CYCLOTOMIC % ('[' + ', '.join(items) + ']')))):
+            result.append((found, {(j,): c for j, c in enumerate(coeffs) if c}))
+    return result
+
+
+def cyclotomic_factors(f, tolerance=1e-6):
+    """([n, ...], residual): the Phi_n dividing a squarefree polynomial f, and f divided by them."""
+    return cyclotomic_factors_all([f], tolerance)[0]
+
+
+def decompose_all(polys):
+    """
+    Structure of every nonzero univariate Laurent polynomial as a dict: sign,
+    content, shift, exponent_gcd, cyclotomic [(n, multiplicity)] and
+    residual [(squarefree polynomial, multiplicity)] for the full factorizer.
+    The squarefree splits and the cyclotomic divisions of all of them are
+    PARI batches (squarefree_all, cyclotomic_factors_all).
+    """
+    structures, primitives = [], []
+    for f in polys:
+        sign, content, shift, primitive = split(f)
+        exponent_gcd = 0
+        for e in primitive:
+            exponent_gcd = math.gcd(exponent_gcd, e[0])
+        structures.append({
+            'sign': sign,
+            'content': content,
+            'shift': shift,
+            'exponent_gcd': exponent_gcd,
+            'cyclotomic': [],
+            'residual': [],
+        })
+        if exponent_gcd:
+            primitives.append(primitive)
+    parts = squarefree_all(primitives)
+    cyclotomic_parts = iter(cyclotomic_factors_all([s for split_parts in parts for s, _ in split_parts]))
+    parts = iter(parts)
+    for structure in structures:
+        if not structure['exponent_gcd']:
+            continue
+        for _, i in next(parts):
+            found, rest = next(cyclotomic_parts)
+            structure['cyclotomic'].extend((n, i) for n in found)
+            if max(e[0] for e in rest) > 0:
+                structure['residual'].append((laurent.normalize(rest), i))
+        structure['cyclotomic'].sort()
+    return structures
+
+
+def decompose(f):
+    """decompose_all() of a single polynomial."""
+    return decompose_all([f])[0]
+
+
+def factor_all(polys, factorizer):
+    """
+    batch_factor-style (sign, content, shift, factors) for every polynomial,
+    with only the residuals of decompose_all() sent to factorizer.factor_all.
+    Also returns the structures.
+    """
+    nonzero = iter(decompose_all([f for f in polys if f]))
+    structures = [next(nonzero) if f else None for f in polys]
+    residuals = [r for s in structures if s for r, _ in s['residual']]
+    factored = iter(factorizer.factor_all(residuals))
+    results = []
+    for s in structures:
+        if s is None:
+            results.append((0, 0, 0, []))
+            continue
+        factors = [(cyclotomic(n), k) for n, k in s['cyclotomic']]
+        for _, i in s['residual']:
+            for g, k in next(factored)[3]:
+                factors.append((g, k * i))
+        results.append((s['sign'], s['content'], s['shift'], factors))
+    return results, structures
+
+
+def report(structure, var='a'):
+    """One line, e.g. -2 * a^-3 * Phi_1^2 * Phi_6 * [degree 4]^1 (exponents in a^2)."""
+    parts = ['%s%d' % ('-' if structure['sign'] < 0 else '', structure['content'])]
+    if structure['shift']:
+        parts.append('%s^%d' % (var, structure['shift']))
+    for n, k in structure['cyclotomic']:
+        parts.append('Phi_%d' % n + ('^%d' % k if k > 1 else ''))
+    for r, i in structure['residual']:
+        parts.append('[degree %d]' % max(e[0] for e in r) + ('^%d' % i if i > 1 else ''))
+    line = ' * '.join(parts)
+    if structure['exponent_gcd'] > 1:
+        line += ' (exponents in %s^%d)' % (var, structure['exponent_gcd'])
+    return line
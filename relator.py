@@ -0,0 +1,201 @@
+"""
+Relators as contiguous int8 arrays, parsed once and shared by every engine.
+
+A relator word over a, b, c, ... (upper case = inverse) is read zero-copy
+from its ASCII bytes and mapped through a 256-entry lookup table to codes
++k / -k for the k-th generator (1-based) and its inverse.  Exponent sums,
+the length and the exponent walk of the multiplicative generator are
+computed once at construction with NumPy instead of str.count scans and
+per-letter comparison chains.
+
+Every Relator is freely and cyclically reduced on construction, so the
+evaluators, hashing and dedupe keys only pay for the reduced length.
+Rearranged paths that are not relators (torsion2/torsion3) opt out with
+reduce=False.
+"""
+import numpy as np
+
+
+_LUT = np.zeros(256, dtype=np.int8)
+for _k in range(26):
+    _LUT[ord('a') + _k] = _k + 1
+    _LUT[ord('A') + _k] = -(_k + 1)
+
+_LETTERS = np.zeros(2 * 26 + 1, dtype=np.uint8)
+for _k in range(26):
+    _LETTERS[26 + _k + 1] = ord('a') + _k
+    _LETTERS[26 - _k - 1] = ord('A') + _k
+
+
+class Relator:
+    """
+    codes           int8 array, +k for generator k and -k for its inverse
+    length          number of letters
+    exponent_sums   int64 array, exponent sum of each generator (at least 2 entries)
+    multiplicative  index of the generator the drivers treat as multiplicative
+                    (the first with zero exponent sum), or None
+    walk            int64 array, exponent of the multiplicative generator in the
+                    prefix before each letter (None without one)
+    """
+    __slots__ = ('word', 'codes', 'length', 'exponent_sums', 'multiplicative', 'walk', '_walks')
+
+    def __init__(self, word, codes=None, reduce=True):
+        if codes is None:
+            codes = encode(word)
+        if reduce:
+            reduced = reduce_codes(codes)
+            if reduced is not codes:
+                codes, word = reduced, None
+        if word is None:
+            word = decode(codes)
+        self.word = word if isinstance(word, str) else word.decode('ascii')
+        self.codes = codes
+        self.length = len(codes)
+        self._walks = {}
+
+        gens = np.abs(codes).astype(np.int64)
+        signs = np.sign(codes).astype(np.int64)
+        num_generators = int(gens.max()) if self.length else 0
+        self.exponent_sums = np.bincount(gens, weights=signs, minlength=max(num_generators, 2) + 1)[1:].astype(np.int64)
+
+        zero = np.flatnonzero(self.exponent_sums == 0)
+        self.multiplicative = int(zero[0]) if len(zero) else None
+        if self.multiplicative is None:
+            self.walk = None
+        else:
+            steps = np.where(gens == self.multiplicative + 1, signs, 0)
+            self.walk = np.cumsum(steps) - steps
+
+    @property
+    def num_generators(self):
+        return len(self.exponent_sums)
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        return self.word
+
+    def __repr__(self):
+        return 'Relator(%r)' % self.word
+
+    def __eq__(self, other):
+        return isinstance(other, Relator) and self.word == other.word
+
+    def __hash__(self):
+        return hash(self.word)
+
+    def reversed(self):
+        return Relator(self.word[::-1], self.codes[::-1], reduce=False)
+
+    def swapped(self, i=0, j=1):
+        """Exchange generators i and j (the drivers' six str.replace swap)."""
+        gens = np.abs(self.codes)
+        codes = self.codes.copy()
+        codes[gens == i + 1] = np.sign(self.codes[gens == i + 1]) * (j + 1)
+        codes[gens == j + 1] = np.sign(self.codes[gens == j + 1]) * (i + 1)
+        return Relator(None, codes, reduce=False)
+
+    def walk_for(self, images):
+        """
+        Exponent walk under arbitrary generator images.
+
+        Returns (before, steps): before[k] is the image of the prefix before
+        letter k and steps[k] the signed image of letter k itself, both of
+        shape (length, nvars).  Cached per images.
+        """
+        key = tuple(map(tuple, images))
+        if key not in self._walks:
+            table = np.array(images, dtype=np.int64)
+            gens = np.abs(self.codes).astype(np.int64) - 1
+            steps = table[gens] * np.sign(self.codes).astype(np.int64)[:, None]
+            self._walks[key] = (np.cumsum(steps, axis=0) - steps, steps)
+        return self._walks[key]
+
+    def fox_terms(self, images):
+        """
+        (generators, exponents, signs) of the abelianized Fox derivative terms:
+        a letter x_j contributes +t^(prefix) to column j and an inverse letter
+        -t^(prefix - n(x_j)).
+        """
+        before, steps = self.walk_for(images)
+        signs = np.sign(self.codes).astype(np.int64)
+        exps = np.where(signs[:, None] > 0, before, before + steps)
+        return np.abs(self.codes).astype(np.int64) - 1, exps, signs
+
+    def evaluate(self, multiplicative=None, reverse=False):
+        """
+        p of the drivers as a laurent.py dict: sum over the additive letters
+        of +-t^E with E the walk of the multiplicative generator.  With
+        reverse=True this is q, the evaluation of the reversed relator.
+        """
+        m = self.multiplicative if multiplicative is None else multiplicative
+        gens = np.abs(self.codes).astype(np.int64)
+        signs = np.sign(self.codes).astype(np.int64)
+        steps = np.where(gens == m + 1, signs, 0)
+        walk = self.walk if m == self.multiplicative else np.cumsum(steps) - steps
+        if reverse:
+            walk = int(steps.sum()) - walk - steps
+        additive = steps == 0
+        return collect(walk[additive][:, None], signs[additive])
+
+
+def decode(codes):
+    return (_LETTERS[codes.astype(np.int64) + 26]).tobytes().decode('ascii')
+
+
+def reduce_codes(codes):
+    """
+    Free and cyclic reduction of a code array in linear time.
+
+    Cancelling pairs (aA, Bb) are removed with a stack, then matching
+    inverse letters are stripped from both ends (conjugation).  Returns the
+    input array itself when it is already cyclically reduced, which NumPy
+    checks without a Python loop.
+    """
+    n = len(codes)
+    if n < 2 or not (np.any(codes[1:] == -codes[:-1]) or codes[0] == -codes[-1]):
+        return codes
+    stack = []
+    for c in codes.tolist():
+        if stack and stack[-1] == -c:
+            stack.pop()
+        else:
+            stack.append(c)
+    i, j = 0, len(stack) - 1
+    while i < j and stack[i] == -stack[j]:
+        i, j = i + 1, j - 1
+    return np.array(stack[i:j + 1], dtype=np.int8)
+
+
+def reduce_word(word):
+    """Free and cyclic reduction of a word given as a string."""
+    stack = []
+    for ch in word:
+        if stack and stack[-1] == ch.swapcase():
+            stack.pop()
+        else:
+            stack.append(ch)
+    i, j = 0, len(stack) - 1
+    while i < j and stack[i] == stack[j].swapcase():
+        i, j = i + 1, j - 1
+    return ''.join(stack[i:j + 1])
+
+
+def encode(word):
+    """int8 codes of a word without building a Relator."""
+    raw = word.encode('ascii') if isinstance(word, str) else word
+    return _LUT[np.frombuffer(raw, dtype=np.uint8)]
+
+
+def as_relator(r):
+    return r if isinstance(r, Relator) else Relator(r)
+
+
+def collect(exps, weights):
+    """Sum weights over equal rows of the exponent array into a laurent.py dict."""
+    if len(exps) == 0:
+        return {}
+    keys, inverse = np.unique(exps, axis=0, return_inverse=True)
+    coeffs = np.bincount(inverse.reshape(-1), weights=weights, minlength=len(keys)).astype(np.int64)
+    return {tuple(int(a) for a in e): int(c) for e, c in zip(keys, coeffs) if c}
@@ -0,0 +1,17 @@
+import glob
+import time
+
+import sampler
+
+
+# Rebuild every recorded relator from its knot and attempt seed, no search
+for path in sorted(glob.glob('relators_*.jsonl')):
+    records = sampler.read_records(path)
+    start = time.time()
+    mismatches = 0
+    for record, M, g in sampler.replay(records):
+        if g.num_generators() != 2 or record['relator'] not in g.relators():
+            mismatches += 1
+    print('--' * 80)
+    print('Records:', path, len(records))
+    print('Replayed in %.2fs, presentation mismatches: %d' % (time.time() - start, mismatches))
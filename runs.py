@@ -0,0 +1,162 @@
+"""
+Run-length and periodicity-aware evaluation of long relators.
+
+A run of k equal additive letters at exponent E contributes k * t^E and a
+run of k multiplicative letters only moves E by k, so a run-length encoded
+relator is evaluated in time proportional to its number of runs.  Repeated
+subwords are handled by evaluating the subword once:
+
+    p(w1 w2)  = p(w1) + t^T(w1) p(w2)
+    p(w^k)    = p(w) (1 + t^T + ... + t^((k-1)T)),   T = T(w)
+              = k p(w)                               if T = 0
+
+A word is described by a spec: a Relator or word (run-length encoded
+automatically), a list of specs (concatenation), or a tuple (spec, k) for
+the k-th power of a spec; compress() builds one from a relator, with
+whole-relator powers and tandem repeats of blocks of runs as powers.
+Parts are taken as written: reducing a subword cyclically would change the
+word it stands for, so only a whole relator is reduced, when it is built
+as a Relator.
+"""
+import numpy as np
+
+import laurent
+from relator import Relator, as_relator, collect, encode
+
+
+def run_length_encode(relator):
+    """(letters, counts): the int8 code and length of each maximal run."""
+    codes = relator.codes if isinstance(relator, Relator) else encode(relator)
+    if len(codes) == 0:
+        return codes, np.zeros(0, dtype=np.int64)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1))
+    counts = np.diff(np.concatenate((starts, [len(codes)])))
+    return codes[starts], counts.astype(np.int64)
+
+
+def evaluate_runs(letters, counts, multiplicative=0):
+    """(p, T) of a run-length encoded word: p a laurent.py dict, T its total exponent."""
+    gens = np.abs(letters).astype(np.int64)
+    signs = np.sign(letters).astype(np.int64)
+    steps = np.where(gens == multiplicative + 1, signs * counts, 0)
+    walk = np.cumsum(steps) - steps
+    additive = steps == 0
+    additive &= gens != 0
+    return collect(walk[additive][:, None], (signs * counts)[additive]), int(steps.sum())
+
+
+def geometric_power(p, T, k):
+    """(p, T) of the k-th power of a word with evaluation p and total exponent T."""
+    if k == 0 or not p:
+        return {}, T * k
+    if T == 0:
+        return laurent.scale(p, k), 0
+    # binary doubling: w^(2m) = w^m w^m, all copies being the same word
+    result, copies, base, base_copies = {}, 0, p, 1
+    while k:
+        if k & 1:
+            result = laurent.add(result, laurent.shift(base, (copies * T,)))
+            copies += base_copies
+        k >>= 1
+        if k:
+            base = laurent.add(base, laurent.shift(base, (base_copies * T,)))
+            base_copies *= 2
+    return result, T * copies
+
+
+def evaluate_spec(spec, multiplicative=0):
+    """(p, T) of a spec; cost scales with runs and distinct subwords, not length."""
+    if isinstance(spec, tuple):
+        sub, k = spec
+        return geometric_power(*evaluate_spec(sub, multiplicative), k)
+    if isinstance(spec, list):
+        p, T = {}, 0
+        for part in spec:
+            q, S = evaluate_spec(part, multiplicative)
+            p = laurent.add(p, laurent.shift(q, (T,)))
+            T += S
+        return p, T
+    return evaluate_runs(*run_length_encode(spec), multiplicative)
+
+
+def expand(spec):
+    """The plain word of a spec, for checking against Relator.evaluate."""
+    if isinstance(spec, tuple):
+        return expand(spec[0]) * spec[1]
+    if isinstance(spec, list):
+        return ''.join(expand(part) for part in spec)
+    return str(spec)
+
+
+def _whole_period(codes):
+    """Smallest period of the letters if they are a proper power, else None (prefix function)."""
+    letters = codes.tolist()
+    n = len(letters)
+    failure = [0] * n
+    k = 0
+    for i in range(1, n):
+        while k and letters[i] != letters[k]:
+            k = failure[k - 1]
+        if letters[i] == letters[k]:
+            k += 1
+        failure[i] = k
+    period = n - failure[-1] if n else 0
+    return period if 0 < period < n and n % period == 0 else None
+
+
+def _part(letters, counts, start, stop):
+    return Relator(None, np.repeat(letters[start:stop], counts[start:stop]), reduce=False)
+
+
+def _repeats(codes, max_period=32, min_saving=8):
+    """
+    Concatenation spec of a word with its tandem repeats as powers, found
+    greedily on the runs: at each run, the block of at most max_period runs
+    repeated back to back that saves the most runs, if it saves at least
+    min_saving.  The word itself when nothing repeats.
+    """
+    letters, counts = run_length_encode(Relator(None, codes, reduce=False))
+    runs = list(zip(letters.tolist(), counts.tolist()))
+    n = len(runs)
+    spec, literal, i = [], 0, 0
+    while i < n:
+        best = None
+        for period in range(2, min(max_period, (n - i) // 2) + 1):
+            if runs[i + period] != runs[i]:
+                continue
+            block = runs[i:i + period]
+            k = 1
+            while i + (k + 1) * period <= n and runs[i + k * period:i + (k + 1) * period] == block:
+                k += 1
+            saving = period * (k - 1)
+            if saving >= min_saving and (best is None or saving > best[0]):
+                best = saving, period, k
+        if best is None:
+            i += 1
+            continue
+        _, period, k = best
+        if literal < i:
+            spec.append(_part(letters, counts, literal, i))
+        spec.append((_part(letters, counts, i, i + period), k))
+        i += period * k
+        literal = i
+    if not spec:
+        return Relator(None, codes, reduce=False)
+    if literal < n:
+        spec.append(_part(letters, counts, literal, n))
+    return spec
+
+
+def compress(relator, max_period=32):
+    """
+    Spec of a relator with its repetitions made explicit: a proper power
+    w^k of a shorter word (prefix function on the letter sequence) becomes
+    (w, k), and tandem repeats of up to max_period runs inside the relator
+    or its period become powers too.  The relator itself when there are none.
+    """
+    rel = as_relator(relator)
+    period = _whole_period(rel.codes)
+    if period is not None:
+        return (_repeats(rel.codes[:period], max_period), len(rel.codes) // period)
+    spec = _repeats(rel.codes, max_period)
+    return rel if isinstance(spec, Relator) else spec
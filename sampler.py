@@ -0,0 +1,198 @@
+"""
+Randomized sampling of knot group presentations.
+
+Every attempt used to go straight from M.randomize() to
+M.fundamental_group(), whose presentation simplification is one of the
+costliest steps, even when the random triangulation had been seen before.
+A Sampler keeps a bounded seen-set of triangulation signatures per knot,
+checked right after randomization; attempts that land on a known
+triangulation skip the group computation and are counted separately.
+
+The isomorphism signature is not the right key: isomorphic triangulations
+with different tetrahedron labels give different presentations (for 8_9
+almost every attempt has one of 3 isosigs but a new relator).  The key is
+the labelled triangulation with its peripheral curves, which determines
+the presentation, kept as a 16-byte digest so that the seen-set stays
+small.
+
+Sampling is seeded: each attempt randomizes a copy of the knot's base
+triangulation after sp.set_rand_seed() with a seed drawn from a generator
+keyed by (seed, worker, knot), so an attempt is fully determined by its own
+seed.  Accepted relators are recorded together with that seed and the
+triangulation isosig, and replay() rebuilds exactly those manifolds and
+presentations without any search.
+
+The presentation itself depends on how the group is computed: the options
+of fundamental_group() give different yields of 2-generator,
+exponent-balanced relators for different knots.  A strategy names one set
+of options (STRATEGIES); the Sampler picks the strategy of each attempt
+with a UCB-style bandit whose reward is an accepted relator not seen before
+and whose index is divided by the mean seconds per attempt, so attempts
+shift toward the strategy that produces new relators fastest for that knot.
+"""
+import hashlib
+import json
+import math
+import random
+import time
+from collections import Counter, OrderedDict
+
+import snappy as sp
+
+from relator import Relator
+
+
+# name -> fundamental_group() options
+STRATEGIES = {
+    'default': {},
+    'no-shorten': {'try_hard_to_shorten_relators': False},
+    'fixed-fillings': {'fillings_may_affect_generators': False},
+    'no-minimize': {'minimize_number_of_generators': False},
+}
+
+
+def triangulation_key(M):
+    """
+    16-byte digest of the combinatorial part of the triangulation file
+    (gluings and peripheral curves, no shapes); the text itself is ~2 KB.
+    """
+    text = '\n'.join(line for line in M._to_string().split('\n') if '.' not in line)
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+class Sampler:
+    def __init__(self, knot_name, seed=0, worker=0, seen_size=1 << 16, record_path=None,
+                 strategies=None):
+        self.knot_name = knot_name
+        self.base = sp.Manifold(knot_name)
+        self.manifold = None
+        self.attempt_seed = None
+        self.rng = random.Random(f'{seed}:{worker}:{knot_name}')
+        self.seen = OrderedDict()
+        self.seen_size = seen_size
+        self.counters = Counter()
+        self.record_path = record_path
+        self.records = []
+        self.strategy = None
+        self.relators = OrderedDict()
+        self.yields = {name: Counter() for name in (strategies or STRATEGIES)}
+
+    def randomize(self):
+        """
+        Randomize a copy of the base triangulation.  Returns its key, or
+        None when the triangulation is already in the seen-set.
+        """
+        self.attempt_seed = self.rng.getrandbits(31)
+        self.manifold = self.base.copy()
+        sp.set_rand_seed(self.attempt_seed)
+        self.manifold.randomize()
+        self.counters['attempts'] += 1
+        key = (self.strategy, triangulation_key(self.manifold))
+        if key in self.seen:
+            self.seen.move_to_end(key)
+            self.counters['duplicate triangulations'] += 1
+            return None
+        self.seen[key] = True
+        if len(self.seen) > self.seen_size:
+            self.seen.popitem(last=False)
+        return key
+
+    def choose(self):
+        """UCB index over strategies: new relators per attempt, per second of sampling."""
+        untried = [name for name, y in self.yields.items() if not y['attempts']]
+        if untried:
+            return untried[0]
+        total = sum(y['attempts'] for y in self.yields.values())
+
+        def index(y):
+            # yields are small rates, so the exploration bonus is scaled by
+            # the (smoothed) rate itself instead of UCB1's worst case of 1
+            rate = (y['accepted'] + 1) / (y['attempts'] + 2)
+            bonus = math.sqrt(2 * rate * math.log(total) / y['attempts'])
+            return (y['accepted'] / y['attempts'] + bonus) * y['attempts'] / y['seconds']
+
+        return max(self.yields, key=lambda name: index(self.yields[name]))
+
+    def sample(self):
+        """
+        Fundamental group of a new random triangulation, computed with the
+        strategy chosen for this attempt, or None for a duplicate.
+        """
+        self.strategy = self.choose()
+        options = STRATEGIES[self.strategy]
+        start = time.perf_counter()
+        g = None
+        if self.randomize() is not None:
+            g = self.manifold.fundamental_group(**options)
+            self.counters['groups'] += 1
+            if g.num_generators() != 2:
+                self.counters['not 2-generator'] += 1
+        y = self.yields[self.strategy]
+        y['attempts'] += 1
+        y['seconds'] += time.perf_counter() - start
+        return g
+
+    def relator(self, g):
+        """The relator of g kept by the drivers: the first one."""
+        return g.relators()[0]
+
+    def accept(self, relator):
+        """
+        Record the last sample as accepted: appended to record_path if set
+        (then only the last record stays in self.records), else kept in
+        self.records.  Only a relator whose reduced word is new rewards the
+        strategy.
+        """
+        record = {'knot': self.knot_name, 'seed': self.attempt_seed, 'strategy': self.strategy,
+                  'isosig': self.manifold.triangulation_isosig(decorated=False),
+                  'relator': str(relator)}
+        self.counters['accepted'] += 1
+        word = Relator(relator).word
+        if word in self.relators:
+            self.relators.move_to_end(word)
+            self.counters['repeated relators'] += 1
+        else:
+            self.relators[word] = True
+            if len(self.relators) > self.seen_size:
+                self.relators.popitem(last=False)
+            self.yields[self.strategy]['accepted'] += 1
+        if self.record_path is None:
+            self.records.append(record)
+        else:
+            # already on disk: keep only the last one, so long runs stay bounded
+            self.records = [record]
+            with open(self.record_path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        return record
+
+    def report(self):
+        lines = [', '.join(f'{key}: {value}' for key, value in self.counters.items())]
+        for name, y in self.yields.items():
+            lines.append(f"    {name}: {y['accepted']} new relators / {y['attempts']} attempts"
+                         f" in {y['seconds']:.2f}s")
+        return '\n'.join(lines)
+
+
+def read_records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def replay(records):
+    """
+    Yield (record, M, g) for every record, rebuilding each manifold from the
+    knot and the attempt seed and the group with the recorded strategy;
+    raises ValueError if a triangulation does not match its recorded isosig.
+    """
+    bases = {}
+    for record in records:
+        knot_name = record['knot']
+        if knot_name not in bases:
+            bases[knot_name] = sp.Manifold(knot_name)
+        M = bases[knot_name].copy()
+        sp.set_rand_seed(record['seed'])
+        M.randomize()
+        if M.triangulation_isosig(decorated=False) != record['isosig']:
+            raise ValueError(f"{knot_name}: seed {record['seed']} does not reproduce {record['isosig']}")
+        options = STRATEGIES[record.get('strategy', 'default')]
+        yield record, M, M.fundamental_group(**options)
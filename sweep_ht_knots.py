@@ -0,0 +1,7 @@
+import knot_sweep
+
+
+# Hoste-Thistlethwaite knots (59937, up to 14 crossings), resumable by shard;
+# the pool workers re-import this module under spawn, so only the main process sweeps
+if __name__ == '__main__':
+    knot_sweep.sweep('ht_knots', 'ht_knots')
@@ -0,0 +1,8 @@
+import links
+
+
+# Rolfsen link table (5^2_1, 6^3_2, ...) and the Hoste-Thistlethwaite link exteriors;
+# the sweeps start process pools, so only the main process runs them
+if __name__ == '__main__':
+    links.sweep('rolfsen', 'links_rolfsen.jsonl')
+    links.sweep('ht', 'links_ht.jsonl')
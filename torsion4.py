@@ -3,46 +3,27 @@ import snappy as sp
 
 from sage.all import *
 
+import fox
+import knot_index
+import laurent
+from cascade import Cascade, radical
+from relator import Relator
+
 
 sys.setrecursionlimit(8912)
 
 
+knot2cascade = {}
 knot2relators = {}
 
 
-def claculate_polynomial_by_a(t, p, ch):
-    if ch == 'a':
-        p = p * t
-    if ch == 'A':
-        p = p / t
-    if ch == 'b':
-        p = p + 1
-    if ch == 'B':
-        p = p - 1
-    return p
-
-
-def claculate_polynomial_by_b(t, p, ch):
-    if ch == 'b':
-        p = p * t
-    if ch == 'B':
-        p = p / t
-    if ch == 'a':
-        p = p + 1
-    if ch == 'A':
-        p = p - 1
-
-    return p
-
-
-def calculate(knot_name, R, g, t, r, a_poly, chosen_function, mapping_description):
-    p_val, q_val = QQ(0), QQ(0)
-
-    for char_in_relator in reversed(r):
-        p_val = chosen_function(t, p_val, char_in_relator)
-
-    for char_in_relator in r:
-        q_val = chosen_function(t, q_val, char_in_relator)
+def calculate(knot_name, R, g, t, rel, a_poly, multiplicative, mapping_description):
+    # Cheap invariants of p first; only relators that pass them are factored
+    p = rel.evaluate(multiplicative)
+    if not knot2cascade[knot_name].screen(p):
+        return
+    p_val = laurent.to_ring(p, [t])
+    q_val = laurent.to_ring(rel.evaluate(multiplicative, reverse=True), [t])
 
     a_result = []
     for a_factor, a_order in list(a_poly.factor()):
@@ -58,7 +39,7 @@ def calculate(knot_name, R, g, t, r, a_poly, chosen_function, mapping_descriptio
         print('--' * 80)
         print('Knot:', knot_name)
         print("Fundamental group (generators: a,b):\n", g)  # g.generators() might be better
-        print("Relator used:", r)
+        print("Relator used:", rel)
         print(f"Mapping chosen: {mapping_description}")
         print("Alexander polynomial (variable 'a'):", a_poly)
         print("Calculated p (nu(S_R)(0,a)):", p_val)
@@ -83,42 +64,52 @@ def check(depth, knot_name):
 
     M = sp.Manifold(knot_name)
     M.randomize()
-    a = M.alexander_polynomial()
 
     g = M.fundamental_group()
+    index.record_attempt(knot_name, g.num_generators() == 2)
     if not g.num_generators() == 2:
+        # sample again while the run's budget lasts, so the index sees every failure
+        if index.retry(knot_name):
+            check(depth + 1, knot_name)
         return
 
-    r = M.fundamental_group().relators()[0]
-    if r in relators:
+    rel = Relator(g.relators()[0])
+    if rel.word in relators:
         return
 
-    cond_a = r.count('a') - r.count('A') == 0
-    cond_b = r.count('b') - r.count('B') == 0
+    cond_a = rel.exponent_sums[0] == 0
+    cond_b = rel.exponent_sums[1] == 0
     if cond_a:
-        chosen_function = claculate_polynomial_by_a
+        multiplicative = 0
         mapping_description = "'a' as multiplicative, 'b' as additive"
-        relators[r] = True
+        relators[rel.word] = True
     elif cond_b:  # Use elif to ensure only one mapping is chosen
-        chosen_function = claculate_polynomial_by_b
+        multiplicative = 1
         mapping_description = "'b' as multiplicative, 'a' as additive"
-        relators[r] = True
+        relators[rel.word] = True
 
     if cond_a or cond_b:
-        calculate(knot_name, R, g, t, r, a, chosen_function, mapping_description)
+        delta = fox.knot_alexander(knot_name, rel, M)
+        index.record_alexander(knot_name, delta)
+        if knot_name not in knot2cascade:
+            # calculate() checks every irreducible factor of delta, so screen with its radical
+            knot2cascade[knot_name] = Cascade(radical(delta))
+        a = laurent.to_ring(laurent.normalize(delta), [t])
+        calculate(knot_name, R, g, t, rel, a, multiplicative, mapping_description)
         print('--' * 80)
         print('relator index:', len(relators))
 
     check(depth + 1, knot_name)
 
 
-# All Rolfsen tables
-knots = []
-for i, j in zip(range(3, 9), [1, 1, 2, 3, 7, 21]):
-    for k in range(1, j + 1):
-        knots.append('%d_%d' % (i, k))
+# All Rolfsen tables, minus knots that never gave 2 generators in earlier runs, cheapest first
+index = knot_index.KnotIndex()
+knots = index.knots(knot_index.rolfsen_knots(8), order='cheapest')
 
 # Check all knots
 for k in knots:
     print('==' * 80)
     check(0, k)
+    index.save()
+    if k in knot2cascade:
+        print('Cascade:', knot2cascade[k].report())
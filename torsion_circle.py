@@ -0,0 +1,43 @@
+import time
+from collections import Counter
+
+import numpy as np
+
+import circle
+import fox
+import laurent
+import trie
+import two_bridge
+
+
+def scan(knot_name, p, q, max_length, limit):
+    start = time.time()
+    delta = fox.relator_alexander(two_bridge.relator(p, q))
+    relators = [rel for rel in two_bridge.family(p, q, max_length, limit) if rel.multiplicative == 0]
+    ps = trie.evaluate_batch(relators)
+    taus = [laurent.sub(p_val, q_val) for p_val, q_val in zip(ps, trie.evaluate_batch(relators, reverse=True))]
+    n = len(relators)
+
+    # Delta, every p and every tau scanned together, repeated zeros counted with multiplicity
+    rows, zeros, multiplicities = circle.scan([delta] + ps + taus)
+    delta_zeros = zeros[rows == 0]
+    tau_counts = Counter(np.bincount(rows, weights=multiplicities, minlength=2 * n + 1)[n + 1:]
+                         .astype(int).tolist())
+
+    # p can only be divisible by Delta if it vanishes at Delta's zeros on the circle
+    coeffs, lows = circle.to_dense(ps)
+    at_zeros = np.abs(circle.evaluate_at(coeffs, lows, delta_zeros))
+    vanishing = np.all(at_zeros <= 1e-8 * np.abs(coeffs).sum(axis=1, keepdims=True), axis=1)
+
+    print('==' * 80)
+    print('Knot: %s = b(%d, %d)' % (knot_name, p, q))
+    print('Relators scanned: %d in %.2fs' % (n, time.time() - start))
+    print('Alexander zeros on the circle (theta / pi):', np.round(delta_zeros / np.pi, 4).tolist())
+    print('p vanishing at every Alexander zero: %d of %d' % (vanishing.sum(), n))
+    print('tau zeros on the circle, with multiplicity (count: relators):', dict(sorted(tau_counts.items())))
+
+
+# 2-bridge knots of the Rolfsen table up to 9 crossings, no Sage needed
+for k, conway in two_bridge.CONWAY.items():
+    p, q = two_bridge.fraction(conway)
+    scan(k, p, q, 4 * p, 20000)
@@ -0,0 +1,68 @@
+from sage.all import *
+
+import cyclic
+import fox
+import laurent
+from relator import Relator
+from sampler import Sampler
+
+
+knot2relators = {}
+
+
+def calculate(knot_name, g, t, rel, a_poly, multiplicative):
+    # One pass over the relator gives p, q and tau for all of its cyclic conjugates
+    torsions = {}
+    for i, (shift_p, D_p, shift_q, D_q) in enumerate(cyclic.cyclic_torsions(rel, multiplicative)):
+        tau = laurent.sub(laurent.shift(D_p, (shift_p,)), laurent.shift(D_q, (shift_q,)))
+        key = tuple(sorted(laurent.normalize(tau).items()))
+        torsions.setdefault(key, (i, tau))
+
+    print('--' * 80)
+    print('Knot:', knot_name)
+    print("Fundamental group (generators: a,b):\n", g)
+    print("Relator used:", rel)
+    print("Alexander polynomial (variable 'a'):", a_poly)
+    print("Cyclic conjugates:", rel.length, "distinct torsions (up to units):", len(torsions))
+    for i, tau in torsions.values():
+        torsion_poly = laurent.to_ring(tau, [t])
+        print(f"    rotation {i}: {torsion_poly}")
+        if torsion_poly != 0:
+            print("        factors:", list(torsion_poly.factor()))
+
+
+def check(knot_name, attempts):
+    if knot_name not in knot2relators:
+        knot2relators[knot_name] = {}
+    relators = knot2relators[knot_name]
+
+    R = PolynomialRing(QQ, 'a')
+    t = R.gen()
+
+    sampler = Sampler(knot_name, record_path='relators_cyclic.jsonl')
+    for _ in range(attempts):
+        g = sampler.sample()
+        if g is None or not g.num_generators() == 2:
+            continue
+
+        word = sampler.relator(g)
+        rel = Relator(word)
+        if rel.word in relators or rel.multiplicative is None:
+            continue
+        relators[rel.word] = True
+        sampler.accept(word)
+        a = laurent.to_ring(laurent.normalize(fox.knot_alexander(knot_name, rel, sampler.base)), [t])
+        calculate(knot_name, g, t, rel, a, rel.multiplicative)
+    print('Sampler:', sampler.report())
+
+
+# All Rolfsen tables
+knots = []
+for i, j in zip(range(3, 9), [1, 1, 2, 3, 7, 21]):
+    for k in range(1, j + 1):
+        knots.append('%d_%d' % (i, k))
+
+# Check all knots
+for k in knots:
+    print('==' * 80)
+    check(k, 256)
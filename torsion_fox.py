@@ -0,0 +1,59 @@
+import snappy as sp
+
+from sage.all import *
+
+import fox
+import laurent
+import modular
+
+
+def to_sage(t, f):
+    return laurent.to_ring(f, [t])
+
+
+def calculate(knot_name, g, t, relators, a_poly):
+    num_generators = g.num_generators()
+    images = [(n,) for n in fox.abelianization(relators, num_generators)]
+    delta = fox.alexander_polynomial(relators, num_generators, images, det=modular.determinant)
+
+    print('--' * 80)
+    print('Knot:', knot_name)
+    print("Fundamental group:\n", g)
+    print("Abelianization:", ', '.join('%s -> a^%d' % (chr(ord('a') + j), n) for j, (n,) in enumerate(images)))
+    print("Alexander polynomial (SnapPy):", a_poly)
+    print("Alexander polynomial (Fox):", to_sage(t, delta))
+
+    for i, row in enumerate(fox.torsion_rows(relators, images)):
+        for j, (p_val, q_val, torsion_poly) in row.items():
+            divides = bool(p_val) and laurent.exact_divide(p_val, delta) is not None
+            print(f"Relator {i} ({relators[i]}), d/d{chr(ord('a') + j)}:")
+            print("    Calculated p:", to_sage(t, p_val))
+            print("    Calculated q:", to_sage(t, q_val))
+            print("    Alexander polynomial divides p:", divides)
+            print("    Calculated Torsion (p-q):", to_sage(t, torsion_poly))
+            if torsion_poly:
+                print("    Calculated Torsion (p-q) factors:", list(factor(to_sage(t, torsion_poly))))
+
+
+def check(knot_name):
+    R = PolynomialRing(QQ, 'a')
+    t = R.gen()
+
+    M = sp.Manifold(knot_name)
+    M.randomize()
+    a = M.alexander_polynomial()
+
+    # Any number of generators: no sample is thrown away
+    g = M.fundamental_group()
+    calculate(knot_name, g, t, g.relators(), a)
+
+
+# All Rolfsen tables
+knots = []
+for i, j in zip(range(3, 12), [1, 1, 2, 3, 7, 21, 49, 165, 552, 2176]):
+    for k in range(1, j + 1):
+        knots.append('%d_%d' % (i, k))
+
+# Check all knots
+for k in knots:
+    check(k)
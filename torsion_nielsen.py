@@ -0,0 +1,94 @@
+import snappy as sp
+
+from sage.all import *
+
+import batch_factor
+import cascade
+import fox
+import laurent
+import nielsen
+import prefactor
+import trie
+from best import BestRelators
+
+
+def seed_relator(knot_name):
+    M = sp.Manifold(knot_name)
+    for _ in range(8192):
+        g = M.fundamental_group()
+        if g.num_generators() == 2:
+            return g.relators()[0]
+        M.randomize()
+    return None
+
+
+knot2best = {}
+factorizer = batch_factor.BatchFactorizer()
+
+
+def calculate(knot_name, t, rel, p, q, factors, structure):
+    torsion_poly = laurent.to_ring(laurent.sub(p, q), [t])
+    print('--' * 80)
+    print('Knot:', knot_name)
+    print("Relator used:", rel, "(length %d)" % rel.length)
+    print(f"Mapping chosen: '{'ab'[rel.multiplicative]}' as multiplicative")
+    print("Calculated p:", laurent.to_ring(p, [t]))
+    print("Calculated q:", laurent.to_ring(q, [t]))
+    print("Calculated Torsion (p-q):", torsion_poly)
+    print("Calculated Torsion (p-q) factors:", batch_factor.format_factors(*factors))
+    if structure is not None:
+        print("Torsion structure:", prefactor.report(structure))
+
+
+def check(knot_name, max_length, limit, batch_size=4096, keep=16):
+    R = PolynomialRing(QQ, 'a')
+    t = R.gen()
+
+    r = seed_relator(knot_name)
+    if r is None:
+        return
+    # cheap invariants reject most explored relators before the exact division
+    screen = cascade.Cascade(fox.alexander_polynomial([r], 2))
+    best = knot2best.setdefault(knot_name, BestRelators(keep))
+    batches = {0: [], 1: []}
+    for rel in nielsen.explore(r, max_length, limit):
+        if rel.multiplicative is None:
+            continue
+        batch = batches[rel.multiplicative]
+        batch.append(rel)
+        if len(batch) == batch_size:
+            evaluate(knot_name, batch, rel.multiplicative, screen, best)
+            batch.clear()
+    for multiplicative, batch in batches.items():
+        evaluate(knot_name, batch, multiplicative, screen, best)
+
+    # Full factorization only for the shortest relators, in one batch, and only
+    # of what is left after the cyclotomic and repeated factors
+    kept = best.best()
+    factors, structures = prefactor.factor_all([laurent.sub(p, q) for _, p, q in kept], factorizer)
+    for (rel, p, q), f, structure in zip(kept, factors, structures):
+        calculate(knot_name, t, rel, p, q, f, structure)
+    print('Alexander test:', screen.report())
+
+
+def evaluate(knot_name, batch, multiplicative, screen, best):
+    # Explored relators share long prefixes (and suffixes): evaluate them through tries
+    ps = trie.evaluate_batch(batch, multiplicative)
+    qs = trie.evaluate_batch(batch, multiplicative, reverse=True)
+    for rel, p, q in zip(batch, ps, qs):
+        if not screen.test(p):
+            continue
+        if best.offer(rel, p, q):
+            print('New shortest relator for %s: %s (length %d, torsion span %d)'
+                  % (knot_name, rel, rel.length, best.record[1]))
+
+
+# All Rolfsen tables
+knots = []
+for i, j in zip(range(3, 9), [1, 1, 2, 3, 7, 21]):
+    for k in range(1, j + 1):
+        knots.append('%d_%d' % (i, k))
+
+for k in knots:
+    print('==' * 80)
+    check(k, 64, 1000)
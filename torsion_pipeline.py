@@ -0,0 +1,26 @@
+import batch_factor
+import knot_index
+import pipeline
+import prefactor
+
+
+if __name__ == '__main__':
+    # (knot, relators wanted, attempts, seed) for every Rolfsen knot up to 10 crossings
+    index = knot_index.KnotIndex()
+    tasks = [(k, 16, 2048, 0) for k in index.knots(knot_index.rolfsen_knots(10), order='cheapest')]
+
+    # SnapPy sampling, evaluation and factoring overlap in separate processes
+    for result in pipeline.run(tasks, samplers=6, evaluators=1, factorizers=2):
+        print('--' * 80)
+        print('Knot:', result['knot'])
+        if 'error' in result:
+            print('Failed in %s:' % result['stage'], result['error'])
+            continue
+        if 'cascade' in result:
+            print('Cascade:', result['cascade'])
+            continue
+        print("Relator used:", result['relator'])
+        print("Alexander polynomial divides p:", result['alexander_divides_p'])
+        print("Calculated Torsion (p-q) factors:", batch_factor.format_factors(*result['tau_factors']))
+        if result['tau_structure'] is not None:
+            print("Torsion structure:", prefactor.report(result['tau_structure']))
@@ -0,0 +1,52 @@
+from sage.all import *
+
+import batch_factor
+import fox
+import laurent
+import two_bridge
+from best import BestRelators
+
+
+factorizer = batch_factor.BatchFactorizer()
+
+
+def calculate(knot_name, t, rel, p, q, factors):
+    torsion_poly = laurent.to_ring(laurent.sub(p, q), [t])
+    print('--' * 80)
+    print('Knot:', knot_name)
+    print("Relator used:", rel, "(length %d)" % rel.length)
+    print("Calculated p:", laurent.to_ring(p, [t]))
+    print("Calculated q:", laurent.to_ring(q, [t]))
+    print("Calculated Torsion (p-q):", torsion_poly)
+    print("Calculated Torsion (p-q) factors:", batch_factor.format_factors(*factors))
+
+
+def check(knot_name, p, q, max_length, limit, keep=16):
+    R = PolynomialRing(QQ, 'a')
+    t = R.gen()
+
+    # No triangulation: the relator comes from the Schubert fraction
+    delta = fox.relator_alexander(two_bridge.relator(p, q))
+    best = BestRelators(keep)
+    for rel in two_bridge.family(p, q, max_length, limit):
+        if rel.multiplicative is None:
+            continue
+        p_val = rel.evaluate()
+        if not p_val or laurent.exact_divide(p_val, delta) is None:
+            continue
+        best.offer(rel, p_val, rel.evaluate(reverse=True))
+
+    print('==' * 80)
+    print('Knot: %s = b(%d, %d)' % (knot_name, p, q))
+    print("Alexander polynomial (variable 'a'):", laurent.to_ring(laurent.normalize(delta), [t]))
+    # One PARI call for all kept torsions, repeats across knots come from the cache
+    kept = best.best()
+    factors = factorizer.factor_all([laurent.sub(p_val, q_val) for _, p_val, q_val in kept])
+    for (rel, p_val, q_val), f in zip(kept, factors):
+        calculate(knot_name, t, rel, p_val, q_val, f)
+
+
+# 2-bridge knots of the Rolfsen table up to 9 crossings
+for k, conway in two_bridge.CONWAY.items():
+    p, q = two_bridge.fraction(conway)
+    check(k, p, q, 4 * p, 1000)
@@ -0,0 +1,43 @@
+import snappy as sp
+
+from sage.all import *
+
+import fox
+import knot_index
+import laurent
+import wirtinger
+
+
+def calculate(knot_name, t, rel):
+    p = rel.evaluate()
+    q = rel.evaluate(reverse=True)
+    delta = fox.relator_alexander(rel)
+    torsion_poly = laurent.to_ring(laurent.sub(p, q), [t])
+    print('--' * 80)
+    print('Knot:', knot_name)
+    print("Relator used:", rel, "(length %d)" % rel.length)
+    print("Alexander polynomial (variable 'a'):", laurent.to_ring(laurent.normalize(delta), [t]))
+    print("Calculated p:", laurent.to_ring(p, [t]))
+    print("Calculated q:", laurent.to_ring(q, [t]))
+    print("Calculated Torsion (p-q):", torsion_poly)
+    if torsion_poly != 0:
+        print("Calculated Torsion (p-q) factors:", list(torsion_poly.factor()))
+
+
+def check(knot_name):
+    R = PolynomialRing(QQ, 'a')
+    t = R.gen()
+
+    # Diagram instead of triangulation: PD code first, then the braid word
+    L = sp.Link(knot_name)
+    rel = wirtinger.from_pd(L.PD_code())
+    if rel is None:
+        rel = wirtinger.from_braid(L.braid_word())
+    if rel is None:
+        print('Knot:', knot_name, 'no 2-generator presentation from its diagram')
+        return
+    calculate(knot_name, t, rel)
+
+
+for k in knot_index.rolfsen_knots(10):
+    check(k)
@@ -0,0 +1,84 @@
+"""
+Prefix-trie evaluation of relator batches that share prefixes.
+
+Relators from nielsen.explore or from the rotations of one knot share long
+prefixes, yet Relator.evaluate walks each from scratch.  Here the batch is
+inserted into a trie of int8 codes and walked depth first once, carrying
+the running exponent of the multiplicative generator and the partial
+Laurent coefficients; entering a node applies its letter and leaving it
+undoes it, so the work is proportional to the number of trie nodes instead
+of the total length of the batch.
+"""
+from relator import as_relator
+
+
+class RelatorTrie:
+    def __init__(self):
+        self.children = [{}]
+        self.terminal = [[]]
+        self.size = 0
+
+    def insert(self, codes, index):
+        node = 0
+        for c in codes.tolist():
+            child = self.children[node].get(c)
+            if child is None:
+                child = len(self.children)
+                self.children[node][c] = child
+                self.children.append({})
+                self.terminal.append([])
+            node = child
+        self.terminal[node].append(index)
+        self.size += 1
+
+    def evaluate(self, multiplicative=0):
+        """
+        Yield (index, p) for every inserted relator, p as a laurent.py dict,
+        from one depth-first walk with an explicit stack.
+        """
+        mult = multiplicative + 1
+        coeffs, exponent = {}, 0
+        for index in self.terminal[0]:
+            yield index, {}
+        stack = [(child, code, False) for code, child in self.children[0].items()]
+        while stack:
+            node, code, leaving = stack.pop()
+            gen, sign = abs(code), 1 if code > 0 else -1
+            if leaving:
+                if gen == mult:
+                    exponent -= sign
+                else:
+                    _bump(coeffs, exponent, -sign)
+                continue
+
+            if gen == mult:
+                exponent += sign
+            else:
+                _bump(coeffs, exponent, sign)
+            for index in self.terminal[node]:
+                yield index, {(e,): c for e, c in coeffs.items()}
+            stack.append((node, code, True))
+            stack.extend((child, c, False) for c, child in self.children[node].items())
+
+
+def _bump(coeffs, exponent, delta):
+    c = coeffs.get(exponent, 0) + delta
+    if c:
+        coeffs[exponent] = c
+    else:
+        del coeffs[exponent]
+
+
+def evaluate_batch(relators, multiplicative=0, reverse=False):
+    """
+    p (q with reverse=True) of every relator in the batch, in input order,
+    with one multiplicative generator for the whole batch.
+    """
+    trie = RelatorTrie()
+    for i, r in enumerate(relators):
+        r = as_relator(r)
+        trie.insert(r.codes[::-1] if reverse else r.codes, i)
+    results = [None] * trie.size
+    for index, p in trie.evaluate(multiplicative):
+        results[index] = p
+    return results
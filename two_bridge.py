@@ -0,0 +1,80 @@
+"""
+One-relator presentations of 2-bridge knots straight from the Schubert
+fraction, without a SnapPy triangulation.
+
+The 2-bridge knot b(p, q) (p odd, 0 < q < p, q odd) has the group
+
+    <a, b | a w = w b>,    w = b^e(1) a^e(2) b^e(3) ... a^e(p-1),
+    e(i) = (-1)^floor(i q / p),
+
+so its relator a w B W has length 2p and costs one NumPy pass to build.
+Both a and b are meridians, so neither generator has exponent sum 0;
+substituting B a for b (the new b is a times the old B, which abelianizes
+to 1) makes a the multiplicative generator the drivers need.  The fraction
+of a knot of the table comes from its Conway notation c1 c2 ... cn as the
+continued fraction p/q = c1 + 1/(c2 + 1/(... + 1/cn)).
+"""
+from fractions import Fraction
+
+import numpy as np
+
+import nielsen
+from relator import Relator
+
+
+# Conway notation of the 2-bridge knots of the Rolfsen table up to 9 crossings
+CONWAY = {
+    '3_1': '3', '4_1': '22', '5_1': '5', '5_2': '32',
+    '6_1': '42', '6_2': '312', '6_3': '2112',
+    '7_1': '7', '7_2': '52', '7_3': '43', '7_4': '313', '7_5': '322', '7_6': '2212',
+    '7_7': '21112',
+    '8_1': '62', '8_2': '512', '8_3': '44', '8_4': '413', '8_6': '332', '8_7': '4112',
+    '8_8': '2312', '8_9': '3113', '8_11': '3212', '8_12': '2222', '8_13': '31112',
+    '8_14': '22112',
+    '9_1': '9', '9_2': '72', '9_3': '63', '9_4': '54', '9_5': '513', '9_6': '522',
+    '9_7': '342', '9_8': '2412', '9_9': '423', '9_10': '333', '9_11': '4122',
+    '9_12': '4212', '9_13': '3213', '9_14': '41112', '9_15': '2322', '9_17': '21312',
+    '9_18': '3222', '9_19': '23112', '9_20': '31212', '9_21': '31122', '9_23': '22122',
+    '9_26': '311112', '9_27': '212112', '9_31': '2111112',
+}
+
+
+def fraction(conway):
+    """Schubert fraction (p, q) of a rational knot from its Conway notation (string or list)."""
+    terms = [int(c) for c in conway]
+    x = Fraction(terms[-1])
+    for c in reversed(terms[:-1]):
+        x = c + 1 / x
+    return x.numerator, x.denominator
+
+
+def schubert_codes(p, q):
+    """int8 codes of w = b^e(1) a^e(2) ... a^e(p-1)."""
+    if p % 2 == 0:
+        raise ValueError(f'b({p}, {q}) is a link, not a knot')
+    q %= p
+    if q % 2 == 0:
+        q = p - q   # the formula needs q odd; b(p, p - q) is the mirror image, same group
+    i = np.arange(1, p)
+    signs = np.where((i * q // p) % 2, -1, 1)
+    gens = np.where(i % 2, 2, 1)
+    return (signs * gens).astype(np.int8)
+
+
+def relator(p, q, balanced=True):
+    """
+    Relator a w B W of b(p, q); with balanced=True rewritten by b -> B a so
+    that a has exponent sum 0.
+    """
+    w = schubert_codes(p, q)
+    codes = np.concatenate(([1], w, [-2], -w[::-1])).astype(np.int8)
+    return Relator(None, nielsen.balance(codes) if balanced else codes)
+
+
+def knot_relator(knot_name, balanced=True):
+    return relator(*fraction(CONWAY[knot_name]), balanced=balanced)
+
+
+def family(p, q, max_length, limit=None, moves=nielsen.MOVES):
+    """The relator of b(p, q) and its images under the Nielsen moves, breadth first."""
+    return nielsen.explore(relator(p, q), max_length, limit, moves)
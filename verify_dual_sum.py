@@ -0,0 +1,38 @@
+import os
+
+import snappy as sp
+
+import dual_sum
+
+
+def live_relators(knots, attempts):
+    for knot_name in knots:
+        M = sp.Manifold(knot_name)
+        for _ in range(attempts):
+            M.randomize()
+            g = M.fundamental_group()
+            if g.num_generators() == 2:
+                yield g.relators()[0]
+
+
+def report(source, checked, counterexamples):
+    print('--' * 80)
+    print('Source:', source)
+    print('Relators checked:', checked)
+    print('Counterexamples:', len(counterexamples))
+    for r in counterexamples[:20]:
+        print('   ', r)
+
+
+# Saved stores
+for path in ['links_rolfsen.jsonl', 'links_ht.jsonl']:
+    if os.path.exists(path):
+        report(path, *dual_sum.verify(dual_sum.read_store(path), multiplicative='auto'))
+
+# Live sweep over the Rolfsen tables
+knots = []
+for i, j in zip(range(3, 12), [1, 1, 2, 3, 7, 21, 49, 165, 552, 2176]):
+    for k in range(1, j + 1):
+        knots.append('%d_%d' % (i, k))
+
+report('live sweep', *dual_sum.verify(live_relators(knots, 64), multiplicative='auto'))
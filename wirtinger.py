@@ -0,0 +1,190 @@
+"""
+Wirtinger presentations from PD codes and braid words, simplified to 2
+generators where possible.
+
+A SnapPy triangulation is a heavy way to get a presentation.  A diagram
+gives one directly: one generator per arc, and at every crossing the
+outgoing under-arc is the incoming one conjugated by the over-arc,
+
+    x_out = x_over^e x_in x_over^-e,    e = +-1 from the crossing sign,
+
+(one relation is redundant).  PD codes use the SnapPy / KnotTheory
+convention X[i, j, k, l]: the under strand runs i -> k and j, l are the
+over strand; the sign only has to be consistent, since the opposite choice
+everywhere presents the mirror image, which has the same group.  A braid
+word (Artin generators +-s for sigma_s) is read strand by strand with its
+closure identifying the bottom arcs with the top ones.
+
+simplify() is a greedy Tietze pass: repeatedly pick a relator in which
+some generator occurs exactly once, solve for it and substitute it into
+the others, choosing the elimination that grows the presentation least,
+with a few randomized passes when that stalls above 2 generators.
+Everything is linear in the diagram size except the substitutions, and the
+result feeds Relator and the evaluators like any SnapPy relator.
+"""
+import random
+from collections import Counter
+
+import numpy as np
+
+import nielsen
+from relator import Relator
+
+
+def _free_reduce(word):
+    stack = []
+    for c in word:
+        if stack and stack[-1] == -c:
+            stack.pop()
+        else:
+            stack.append(c)
+    i, j = 0, len(stack) - 1
+    while i < j and stack[i] == -stack[j]:
+        i, j = i + 1, j - 1
+    return stack[i:j + 1]
+
+
+def _invert(word):
+    return [-c for c in reversed(word)]
+
+
+def pd_relators(pd):
+    """
+    (relators, num_generators) of the Wirtinger presentation of a knot PD
+    code.  Relators are lists of nonzero ints, +-(g + 1) for generator g.
+    """
+    edges = sorted({e for x in pd for e in x})
+    parent = {e: e for e in edges}
+
+    def find(e):
+        while parent[e] != e:
+            parent[e] = parent[parent[e]]
+            e = parent[e]
+        return e
+
+    for i, j, k, l in pd:
+        parent[find(j)] = find(l)
+    arcs = {}
+    for e in edges:
+        arcs.setdefault(find(e), len(arcs))
+
+    m = len(edges)
+    relators = []
+    for i, j, k, l in pd:
+        over, under_in, under_out = arcs[find(j)] + 1, arcs[find(i)] + 1, arcs[find(k)] + 1
+        e = 1 if (j - l) % m == 1 else -1
+        relators.append([-under_out, e * over, under_in, -e * over])
+    # any one relation follows from the others
+    return relators[:-1], len(arcs)
+
+
+def braid_relators(braid, strands=None):
+    """(relators, num_generators) of the Wirtinger presentation of a braid closure."""
+    if strands is None:
+        strands = max(abs(s) for s in braid) + 1
+    current = list(range(strands))
+    count = strands
+    relators = []
+    for s in braid:
+        i = abs(s) - 1
+        left, right = current[i], current[i + 1]
+        over, under = (left, right) if s > 0 else (right, left)
+        e = 1 if s > 0 else -1
+        relators.append([-(count + 1), e * (over + 1), under + 1, -e * (over + 1)])
+        current[i], current[i + 1] = (count, over) if s > 0 else (over, count)
+        count += 1
+    # the closure joins the bottom arc at each position to the top one; those
+    # are identifications, so the redundant relation dropped is a crossing's
+    relators.extend([current[p] + 1, -(p + 1)] for p in range(strands) if current[p] != p)
+    return relators[1:], count
+
+
+def _substitute(relators, index, g):
+    """Solve relators[index] for generator g (one occurrence) and substitute it into the rest."""
+    r = relators[index]
+    pos = next(p for p, c in enumerate(r) if abs(c) == g)
+    rest = r[pos + 1:] + r[:pos]
+    # r ~ g^e rest, so g = rest^-1 (e = 1) or g = rest (e = -1)
+    value = _invert(rest) if r[pos] > 0 else rest
+    inverse = _invert(value)
+    substituted = []
+    for w in relators[:index] + relators[index + 1:]:
+        out = []
+        for c in w:
+            if c == g:
+                out.extend(value)
+            elif c == -g:
+                out.extend(inverse)
+            else:
+                out.append(c)
+        out = _free_reduce(out)
+        if out:
+            substituted.append(out)
+    return substituted
+
+
+def _greedy(relators, num_generators, target, rng=None):
+    alive = set(range(1, num_generators + 1))
+    while len(alive) > target:
+        total = Counter(abs(c) for r in relators for c in r)
+        candidates = []
+        for index, r in enumerate(relators):
+            for g, n in Counter(abs(c) for c in r).items():
+                if n == 1:
+                    candidates.append(((len(r) - 2) * (total[g] - 1), len(r), index, g))
+        if not candidates:
+            break
+        if rng is None:
+            _, _, index, g = min(candidates)
+        else:
+            cheapest = min(candidates)[0]
+            _, _, index, g = rng.choice([c for c in candidates if c[0] <= 2 * cheapest + 4])
+        relators = _substitute(relators, index, g)
+        alive.discard(g)
+    return relators, alive
+
+
+def simplify(relators, num_generators, target=2, tries=16, seed=0):
+    """
+    Greedy Tietze eliminations down to target generators where possible.
+    Each elimination solves a relator for a generator occurring once in it,
+    cheapest growth first; when that stalls above target, up to tries more
+    passes break ties at random among the cheap eliminations.  Returns
+    (relators, num_generators) with the survivors renumbered.
+    """
+    relators = [w for w in (_free_reduce(r) for r in relators) if w]
+    best = _greedy(relators, num_generators, target)
+    rng = random.Random(seed)
+    for _ in range(tries):
+        if len(best[1]) <= target:
+            break
+        result = _greedy(relators, num_generators, target, rng)
+        if len(result[1]) < len(best[1]):
+            best = result
+
+    relators, alive = best
+    names = {g: n + 1 for n, g in enumerate(sorted(alive))}
+    return [[names[abs(c)] * (1 if c > 0 else -1) for c in r] for r in relators], len(alive)
+
+
+def to_relator(relators, num_generators, balanced=True):
+    """
+    The Relator of a simplified 1-relator, 2-generator presentation (None
+    otherwise); with balanced=True, B a is substituted for b when no
+    generator has exponent sum 0, as for meridian generators.
+    """
+    if num_generators != 2 or len(relators) != 1:
+        return None
+    codes = np.array(relators[0], dtype=np.int8)
+    rel = Relator(None, codes)
+    if balanced and rel.multiplicative is None:
+        rel = Relator(None, nielsen.balance(rel.codes))
+    return rel
+
+
+def from_pd(pd, balanced=True):
+    return to_relator(*simplify(*pd_relators(pd)), balanced=balanced)
+
+
+def from_braid(braid, strands=None, balanced=True):
+    return to_relator(*simplify(*braid_relators(braid, strands)), balanced=balanced)